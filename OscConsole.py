@@ -1,6 +1,6 @@
 #!/opt/local/bin/python
 # -*- coding: utf-8 -*-
-from osc.OSC import OSCServer, OSCClient, OSCMessage
+from osc.OSC import OSCServer, OSCClient, OSCMessage, OSCServerError, OSCGCMonitor, setThreadRealtime, freezeGC
 import sys
 from PySide import QtGui, QtCore
 from threading import Thread
@@ -9,14 +9,18 @@ import Queue as queue
 import UX.MainWindow
 from time import time, clock
 import re
+import argparse
 
 
 class ThreadedSender(QtCore.QThread):
-	def __init__(self, log_function, parent=None):
+	def __init__(self, log_function, parent=None, sequencing=None):
+		'''sequencing may be 'bundle' or 'argument' to number the sent messages
+		(see OSCClient.setSequencing). '''
 		QtCore.QThread.__init__(self, parent)
 		self.is_running = False
 		self._destination = ("127.0.0.1", 0)
 		self.client = OSCClient()
+		self.client.setSequencing(sequencing)
 		self.queue = queue.Queue(100)
 		self.log = log_function
 
@@ -40,8 +44,7 @@ class ThreadedSender(QtCore.QThread):
 		while self.is_running:
 			try:
 				message = self.queue.get(True, 0.1)
-				self.client.sendto(message, self.destination, 0.5)
-				print(c2 - c1)
+				self.client.sendto(message, self.destination)
 			except queue.Empty as e:
 				pass
 			except Exception as e:
@@ -51,7 +54,9 @@ class ThreadedSender(QtCore.QThread):
 
 
 class LogPlayer(QtCore.QThread):
-	def __init__(self, log_function, osc_message_callback, parent=None):
+	def __init__(self, log_function, osc_message_callback, get_realtime_options=None, parent=None):
+		'''get_realtime_options, if given, returns the real-time options to apply to the
+		playback thread when it starts, e.g. {'affinity': [1], 'fifo_priority': 50} (see setThreadRealtime). '''
 		super(LogPlayer, self).__init__(parent)
 		self.log = log_function
 		self.osc_message_callback = osc_message_callback
@@ -71,6 +76,7 @@ class LogPlayer(QtCore.QThread):
 		self._state = 'stopped'
 		self._inside_tick = False
 		self.enable_looping = False
+		self.get_realtime_options = get_realtime_options
 
 	@property
 	def current_playback_time(self):
@@ -209,6 +215,11 @@ class LogPlayer(QtCore.QThread):
 			self.log("Error opening file "+filename+"\n"+str(e))
 
 	def run(self):
+		realtime_options = self.get_realtime_options() if self.get_realtime_options else None
+		if realtime_options:
+			for knob, result in setThreadRealtime(**realtime_options).items():
+				if result is not True:
+					self.log("Playback thread: unable to set {}: {}".format(knob, result))
 		self.exec_()
 
 	def tick(self):
@@ -263,7 +274,9 @@ class LogPlayer(QtCore.QThread):
 
 
 class OscConsole(QtGui.QApplication):
-	def __init__(self, argv):
+	def __init__(self, argv, realtime_options=None):
+		'''realtime_options are applied to the server and playback threads,
+		e.g. {'affinity': [1], 'fifo_priority': 50} (see setThreadRealtime). '''
 		super(OscConsole, self).__init__(argv)
 		self.port_number = 37000
 		self._forward_host = "127.0.0.1"
@@ -282,7 +295,16 @@ class OscConsole(QtGui.QApplication):
 		self.sender = ThreadedSender(self.log, self)
 		self.sender.start()
 
-		self.log_player = LogPlayer(self.log, self.new_osc_message_callback)
+		self.realtime_options = realtime_options
+		self.log_player = LogPlayer(self.log, self.new_osc_message_callback, lambda: self.realtime_options)
+
+		self.gc_monitor = OSCGCMonitor(report_threshold=0.005, report=self.log_gc_pause)
+		self.gc_monitor.start()
+
+		self.sequence_stats = {}
+		self.sequence_timer = QtCore.QTimer()
+		self.sequence_timer.timeout.connect(self.log_sequence_stats)
+		self.sequence_timer.start(5000)
 
 		self.change_mode('live')
 		self.aboutToQuit.connect(self.close)
@@ -353,6 +375,14 @@ class OscConsole(QtGui.QApplication):
 		self.log('Opening server on port {}'.format(self.port_number))
 		try:
 			self.server = OSCServer(('localhost',self.port_number))
+			try:
+				self.server.setKernelTimestamps(True)
+			except OSCServerError as e:
+				self.log('Kernel timestamps unavailable, timing messages on arrival: '+str(e))
+			if self.realtime_options:
+				self.server.setRealtime(**self.realtime_options)
+			self.server.setSequenceTracking('bundle')
+			self.sequence_stats = {}
 			self.server.addMsgHandler('default', self.new_osc_message_callback)
 			self.serverThread = Thread(target=self.server.serve_forever)
 			self.serverThread.start()
@@ -360,7 +390,24 @@ class OscConsole(QtGui.QApplication):
 			self.log('Unable to open server on port {}. Possibly it is already open.'.format(self.port_number))
 			self.log(str(e))
 
+	def log_sequence_stats(self):
+		'''Logs packet loss, duplicates and reordering of sources numbering their packets,
+		whenever these have changed. '''
+		if not hasattr(self, 'server') or not self.server.running:
+			return
+		for source, stats in self.server.getSequenceStats().items():
+			previous = self.sequence_stats.get(source)
+			self.sequence_stats[source] = stats
+			if previous is None or any(stats[k] != previous[k] for k in ('lost', 'duplicates', 'reordered', 'stale', 'restarts')):
+				self.log('{0[0]}:{0[1]} received {1[received]}, lost {1[lost]}, duplicates {1[duplicates]}, '
+					'reordered {1[reordered]}, stale {1[stale]}, restarts {1[restarts]}'.format(source, stats))
+
+	def log_gc_pause(self, pause, generation):
+		self.log('Garbage collection (generation {}) paused for {:.1f} ms'.format(generation, pause*1000.), screen_only=True)
+
 	def close(self):
+		self.gc_monitor.stop()
+		self.sequence_timer.stop()
 		self.close_server()
 		self.log("Stopping sender thread")
 		self.sender.close()
@@ -376,7 +423,10 @@ class OscConsole(QtGui.QApplication):
 		self.serverThread.join()
 		self.server.close()
 
-	def new_osc_message_callback(self, path, tags, args, source, time_override=None):
+	def new_osc_message_callback(self, path, tags, args, source, time_override=None, timestamp=None):
+		'''timestamp may be the arrival time in nanoseconds since the epoch. '''
+		if time_override is None and timestamp is not None:
+			time_override = QtCore.QDateTime.fromMSecsSinceEpoch(timestamp // 1000000)
 		# source path tags: args
 		formatted_message = '{0[0]}:{0[1]} {1} ({2}): {3}'.format(
 			source, path, tags, ', '.join(map(str,args)))
@@ -604,11 +654,27 @@ def seconds_to_qtime(value):
 
 
 
+def parse_realtime_options(argv):
+	'''Parses the real-time tuning options from argv. Returns (realtime_options, remaining argv),
+	where realtime_options is a dict for setThreadRealtime, or None if no options were given. '''
+	parser = argparse.ArgumentParser(add_help=False)
+	parser.add_argument('--rt-cpus', dest='affinity', type=lambda s: [int(cpu) for cpu in s.split(',')],
+		help="pin the server and playback threads to these CPUs, e.g. 2,3")
+	parser.add_argument('--rt-priority', dest='fifo_priority', type=int,
+		help="run the server and playback threads with this SCHED_FIFO priority")
+	parser.add_argument('--rt-nice', dest='nice', type=int,
+		help="run the server and playback threads with this nice value")
+	options, remaining = parser.parse_known_args(argv[1:])
+	realtime_options = dict((knob, value) for knob, value in vars(options).items() if value is not None)
+	return (realtime_options or None), argv[:1] + remaining
+
 def main():
-	argv = sys.argv
+	realtime_options, argv = parse_realtime_options(sys.argv)
 	argv[0] = "OSC Console"
-	app = OscConsole(argv)
+	app = OscConsole(argv, realtime_options)
 	main_Window = MainWindow(app)
+	# everything long-lived exists now; keep it out of the garbage collector's way
+	freezeGC()
 	return_code = app.exec_()
 	app.close()
 	sys.exit(return_code)
@@ -158,9 +158,10 @@ Original Comments
 > 	- dwh
 """
 
-import math, re, socket, select, string, struct, sys, threading, time, types, array, errno, inspect
+import math, re, socket, select, string, struct, sys, threading, time, types, array, errno, inspect, copy, heapq, itertools, collections, functools, asyncio, os, gc
 from socketserver import UDPServer, DatagramRequestHandler, ThreadingMixIn, StreamRequestHandler, TCPServer
 from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
 
 global version
 version = ("0.3","6", "$Rev: 6382 $"[6:-2])
@@ -179,6 +180,12 @@ del timegm
 global NTP_units_per_second
 NTP_units_per_second = 0x100000000 # about 232 picoseconds
 
+global SO_TIMESTAMPNS
+if sys.platform.startswith('linux'):
+	SO_TIMESTAMPNS = getattr(socket, 'SO_TIMESTAMPNS', 35) # not exported by the socket module
+else:
+	SO_TIMESTAMPNS = None
+
 ##
 # numpy/scipy support:
 ##
@@ -205,6 +212,67 @@ try:
 except ImportError:
 	pass
 
+######
+#
+# NTP time
+#
+######
+
+class NTPTime(int):
+	"""An exact 64-bit NTP timestamp, as used in OSC-timetags.
+	The upper 32 bits hold the seconds since 1 Jan 1900, the lower 32 bits hold the fraction of a second.
+
+	NTPTime objects are ints, so they compare, sort & subtract exactly, without the rounding
+	that 'Python Time' (floating seconds since the Epoch) introduces at sub-microsecond precision.
+	The value 0 means 'immediately'.
+	  >>> t = NTPTime.now()
+	  >>> t.seconds()		# floating seconds since the Epoch
+	  >>> t.ns()			# integer nanoseconds since the Epoch
+	"""
+	@classmethod
+	def fromSeconds(cls, secs):
+		"""Returns the NTPTime for the given floating seconds since the Epoch
+		"""
+		if secs <= 0:
+			return cls(0)
+
+		fract, secs = math.modf(secs)
+		return cls(((int(secs) - NTP_epoch) << 32) + int(fract * NTP_units_per_second))
+
+	@classmethod
+	def fromNs(cls, ns):
+		"""Returns the NTPTime for the given integer nanoseconds since the Epoch
+		"""
+		if ns <= 0:
+			return cls(0)
+
+		return cls(((ns - NTP_epoch * 1000000000) << 32) // 1000000000)
+
+	@classmethod
+	def now(cls):
+		"""Returns the current time as an NTPTime
+		"""
+		return cls.fromNs(time.time_ns())
+
+	def seconds(self):
+		"""Returns the time in floating seconds since the Epoch, or 0.0 for 'immediately'
+		"""
+		if self <= 1:
+			return 0.0
+
+		return (NTP_epoch + (self >> 32)) + float((self & 0xffffffff) / NTP_units_per_second)
+
+	def ns(self):
+		"""Returns the time in integer nanoseconds since the Epoch (rounded), or 0 for 'immediately'
+		"""
+		if self <= 1:
+			return 0
+
+		return ((int(self) * 1000000000 + 0x80000000) >> 32) + NTP_epoch * 1000000000
+
+	def __repr__(self):
+		return "NTPTime(0x%016x)" % int(self)
+
 ######
 #
 # OSCMessage classes
@@ -288,7 +356,7 @@ class OSCMessage(object):
 		if typehint == 'b':
 			binary = OSCBlob(argument)
 			tag = 'b'
-		elif typehint == 't':
+		elif (typehint == 't') or ((typehint == None) and isinstance(argument, NTPTime)):
 			binary = OSCTimeTag(argument)
 			tag = 't'
 		else:
@@ -580,6 +648,7 @@ class OSCBundle(OSCMessage):
 	  The OSCBundle's 'address' is inherited by any OSCMessage the OSCBundle object creates.
 	  - OSC-bundles have a timetag to tell the receiver when the bundle should be processed.
 	  The default timetag value (0) means 'immediately'
+	  The timetag is stored exactly, as an NTPTime.
 	"""
 	def __init__(self, address="", time=0):
 		"""Instantiate a new OSCBundle.
@@ -588,12 +657,13 @@ class OSCBundle(OSCMessage):
 		The bundle's timetag can be set with the 'time' argument
 		"""
 		super(OSCBundle, self).__init__(address)
-		self.timetag = time
+		self.timetag = NTPTime(0)
+		self.setTimeTag(time)
 
 	def __str__(self):
 		"""Returns the Bundle's contents (and timetag, if nonzero) as a string.
 		"""
-		if (self.timetag > 0.):
+		if (self.timetag > 0):
 			out = "#bundle (%s) [" % self.getTimeTagStr()
 		else:
 			out = "#bundle ["
@@ -607,15 +677,23 @@ class OSCBundle(OSCMessage):
 	
 	def setTimeTag(self, time):
 		"""Set or change the OSCBundle's TimeTag
-		In 'Python Time', that's floating seconds since the Epoch
+		In 'Python Time', that's floating seconds since the Epoch.
+		An NTPTime is used as-is, without rounding.
 		"""
-		if time >= 0:
+		if isinstance(time, NTPTime):
 			self.timetag = time
+		elif time >= 0:
+			self.timetag = NTPTime.fromSeconds(time)
+	
+	def getTimeTag(self):
+		"""Return the TimeTag in floating seconds since the Epoch, or 0.0 for 'immediately'
+		"""
+		return self.timetag.seconds()
 	
 	def getTimeTagStr(self):
 		"""Return the TimeTag as a human-readable string
 		"""
-		fract, secs = math.modf(self.timetag)
+		fract, secs = math.modf(self.getTimeTag())
 		out = time.ctime(secs)[11:19]
 		out += ("%.3f" % fract)[1:]
 		
@@ -772,13 +850,14 @@ def OSCArgument(next, typehint=None):
 	return (tag, binary)
 
 def OSCTimeTag(time):
-	"""Convert a time in floating seconds to its
+	"""Convert a time in floating seconds, or an NTPTime, to its
 	OSC binary representation
 	"""
-	if time > 0:
-		fract, secs = math.modf(time)
-		secs = secs - NTP_epoch
-		binary = struct.pack('>LL', int(secs), int(fract * NTP_units_per_second))
+	if not isinstance(time, NTPTime):
+		time = NTPTime.fromSeconds(time)
+	
+	if time > 1:
+		binary = struct.pack('>Q', time & 0xffffffffffffffff)
 	else:
 		binary = struct.pack('>LL', 0, 1)
 
@@ -790,27 +869,40 @@ def OSCTimeTag(time):
 #
 ######
 
-def _readString(data):
+def _readString(data, strict=False):
 	"""Reads the next (null-terminated) block of data
+	In strict mode, raises OSCDecodeError if the string isn't terminated or its padding is truncated.
 	"""
 	length   = data.find(b'\0')
 	nextData = int(math.ceil((length+1) / 4.0) * 4)
+	if strict and ((length < 0) or (nextData > len(data))):
+		raise OSCDecodeError("unterminated or truncated string")
 	return (data[0:length].decode('latin1'), data[nextData:])
 
-def _readBlob(data):
+def _readBlob(data, strict=False):
 	"""Reads the next (numbered) block of data
+	In strict mode, raises OSCDecodeError if the data is shorter than the blob's size.
 	"""
+	if len(data) < 4:
+		if strict:
+			raise OSCDecodeError("too few bytes for blob-size")
+		return (b'', data)
 	
 	length   = struct.unpack(">i", data[0:4])[0]
 	nextData = int(math.ceil((length) / 4.0) * 4) + 4
+	if strict and ((length < 0) or (nextData > len(data))):
+		raise OSCDecodeError("blob-size %d exceeds data" % length)
 	return (data[4:length+4], data[nextData:])
 
-def _readInt(data):
+def _readInt(data, strict=False):
 	"""Tries to interpret the next 4 bytes of the data
-	as a 32-bit integer. """
+	as a 32-bit integer. 
+	If there are too few bytes, returns 0, or raises OSCDecodeError in strict mode.
+	"""
 	
 	if(len(data)<4):
-		print("Error: too few bytes for int", data, len(data))
+		if strict:
+			raise OSCDecodeError("too few bytes for int")
 		rest = data
 		integer = 0
 	else:
@@ -819,35 +911,46 @@ def _readInt(data):
 
 	return (integer, rest)
 
-def _readLong(data):
+def _readLong(data, strict=False):
 	"""Tries to interpret the next 8 bytes of the data
 	as a 64-bit signed integer.
+	If there are too few bytes, returns 0, or raises OSCDecodeError in strict mode.
 	 """
+	if(len(data)<8):
+		if strict:
+			raise OSCDecodeError("too few bytes for long")
+		return (0, data)
 
 	high, low = struct.unpack(">ll", data[0:8])
 	big = (int(high) << 32) + low
 	rest = data[8:]
 	return (big, rest)
 
-def _readTimeTag(data):
+def _readTimeTag(data, strict=False):
 	"""Tries to interpret the next 8 bytes of the data
-	as a TimeTag.
+	as a TimeTag, returned as an (exact) NTPTime.
+	If there are too few bytes, returns 0 ('immediately'), or raises OSCDecodeError in strict mode.
 	 """
-	high, low = struct.unpack(">LL", data[0:8])
-	if (high == 0) and (low <= 1):
-		time = 0.0
-	else:
-		time = int(NTP_epoch + high) + float(low / NTP_units_per_second)
+	if(len(data)<8):
+		if strict:
+			raise OSCDecodeError("too few bytes for timetag")
+		return (NTPTime(0), data)
+
+	time = struct.unpack(">Q", data[0:8])[0]
+	if time <= 1:
+		time = 0
 	rest = data[8:]
-	return (time, rest)
+	return (NTPTime(time), rest)
 
-def _readFloat(data):
+def _readFloat(data, strict=False):
 	"""Tries to interpret the next 4 bytes of the data
 	as a 32-bit float. 
+	If there are too few bytes, returns 0, or raises OSCDecodeError in strict mode.
 	"""
 	
 	if(len(data)<4):
-		print("Error: too few bytes for float", data, len(data))
+		if strict:
+			raise OSCDecodeError("too few bytes for float")
 		rest = data
 		float = 0
 	else:
@@ -856,13 +959,15 @@ def _readFloat(data):
 
 	return (float, rest)
 
-def _readDouble(data):
+def _readDouble(data, strict=False):
 	"""Tries to interpret the next 8 bytes of the data
 	as a 64-bit float. 
+	If there are too few bytes, returns 0, or raises OSCDecodeError in strict mode.
 	"""
 	
 	if(len(data)<8):
-		print("Error: too few bytes for double", data, len(data))
+		if strict:
+			raise OSCDecodeError("too few bytes for double")
 		rest = data
 		float = 0
 	else:
@@ -871,12 +976,14 @@ def _readDouble(data):
 
 	return (float, rest)
 
-def decodeOSC(data):
+def decodeOSC(data, strict=False):
 	"""Converts a binary OSC message to a Python list. 
+	In strict mode, raises OSCDecodeError if the data is truncated or otherwise malformed,
+	instead of decoding as much as possible.
 	"""
 	table = {"i":_readInt, "f":_readFloat, "s":_readString, "b":_readBlob, "d":_readDouble, "t":_readTimeTag}
 	decoded = []
-	address,  rest = _readString(data)
+	address,  rest = _readString(data, strict)
 	if address.startswith(","):
 		typetags = address
 		address = ""
@@ -884,25 +991,35 @@ def decodeOSC(data):
 		typetags = ""
 
 	if address == "#bundle":
-		time, rest = _readTimeTag(rest)
+		time, rest = _readTimeTag(rest, strict)
 		decoded.append(address)
 		decoded.append(time)
 		while len(rest)>0:
-			length, rest = _readInt(rest)
-			decoded.append(decodeOSC(rest[:length]))
+			if len(rest) < 4:
+				if strict:
+					raise OSCDecodeError("%d stray bytes after bundle-elements" % len(rest))
+				break
+			length, rest = _readInt(rest, strict)
+			if (length <= 0) or (strict and (length > len(rest))):
+				if strict:
+					raise OSCDecodeError("bundle-element size %d exceeds data" % length)
+				break
+			decoded.append(decodeOSC(rest[:length], strict))
 			rest = rest[length:]
 
 	elif len(rest)>0:
 		if not len(typetags):
-			typetags, rest = _readString(rest)
+			typetags, rest = _readString(rest, strict)
 		decoded.append(address)
 		decoded.append(typetags)
 		if typetags.startswith(","):
 			for tag in typetags[1:]:
-				value, rest = table[tag](rest)
+				if strict and (tag not in table):
+					raise OSCDecodeError("unknown typetag '%s'" % tag)
+				value, rest = table[tag](rest, strict)
 				decoded.append(value)
 		else:
-			raise OSCError("OSCMessage's typetag-string lacks the magic ','")
+			raise OSCDecodeError("OSCMessage's typetag-string lacks the magic ','")
 
 	return decoded
 
@@ -922,7 +1039,7 @@ def hexDump(bytes):
 	num = len(bytes)
 	for i in range(num):
 		if (i) % 16 == 0:
-			line = "%02X0 : " % (i/16)
+			line = "%02X0 : " % (i//16)
 		line += "%02X " % bytes[i]
 		if (i+1) % 16 == 0:
 			print("%s: %s" % (line, repr(bytes[i-15:i+1])))
@@ -958,10 +1075,7 @@ def getUrlStr(*args):
 		prefix = ""
 	
 	if len(host) and (host != '0.0.0.0'):
-		try:
-			(host, _, _) = socket.gethostbyaddr(host)
-		except socket.error:
-			pass
+		host = resolver.addrToName(host, wait=False)
 	else:
 		host = 'localhost'
 	
@@ -970,9 +1084,198 @@ def getUrlStr(*args):
 	else:
 		return host + prefix
 		
-def parseUrlStr(url):
+class OSCResolver(object):
+	"""Caching host-name resolver, shared by the OSC clients & servers (see the module-level 'resolver').
+	Lookups are cached for 'ttl' seconds, and failed lookups for 'negative_ttl' seconds. At most 'max_entries'
+	lookups are cached; the least-recently used ones are forgotten first.
+	Lookups that shouldn't block the caller are done by a single background worker-thread, from a queue
+	holding at most 'max_pending' lookups; further lookups are dropped while it is full.
+	With 'background_refresh', an expired entry is still returned once while it is looked up again
+	by the worker, so a cached name never blocks the caller.
+	The actual lookups are done by the 'resolve' (name -> IP-address) and 'reverse' (IP-address -> name)
+	functions, which default to socket.gethostbyname() & socket.gethostbyaddr(), and can be replaced
+	by stubs for testing. Both should raise socket.error when a lookup fails.
+	"""
+	# the maximum number of cached lookups
+	max_entries = 4096
+	
+	# the maximum number of lookups queued for the worker-thread
+	max_pending = 256
+	
+	def __init__(self, ttl=300., negative_ttl=30., background_refresh=False, resolve=None, reverse=None):
+		"""Instantiate an OSCResolver
+		"""
+		self.ttl = ttl
+		self.negative_ttl = negative_ttl
+		self.background_refresh = background_refresh
+		if resolve == None:
+			resolve = socket.gethostbyname
+		if reverse == None:
+			reverse = lambda addr: socket.gethostbyaddr(addr)[0]
+		self.resolve = resolve
+		self.reverse = reverse
+		self._cache = collections.OrderedDict()	# (function, host) -> (result, expiry-time), least-recently used first
+		self._pending = {}						# (function, host) -> [callback, ...], queued for the worker
+		self._queue = collections.deque()
+		self._cond = threading.Condition()
+		self._thread = None
+		self.lookups = 0
+		self.dropped = 0
+	
+	def isAddress(self, host):
+		"""Returns True if the given host is a numeric IPv4 or IPv6 address (which needs no lookup)
+		"""
+		for family in (socket.AF_INET, socket.AF_INET6):
+			try:
+				socket.inet_pton(family, host)
+				return True
+			except (socket.error, ValueError, TypeError):
+				pass
+		
+		return False
+	
+	def nameToAddr(self, host, wait=True):
+		"""Returns the IP-address of the given host-name, or the host-name itself if the lookup fails
+		(or if the host is an IP-address already). With wait=False, a host-name not in the cache is
+		returned as-is, while it is looked up in the background.
+		"""
+		if self.isAddress(host):
+			return host
+		
+		return self._lookup(self.resolve, host, wait)
+	
+	def nameToAddrLater(self, host, callback):
+		"""Returns the IP-address of the given host-name right away if the host is an IP-address already,
+		or if its lookup is cached. Otherwise, queues the lookup and returns None; 'callback(address)' is
+		then called from the worker-thread once the host is looked up (with the host-name itself if the lookup failed).
+		Raises OSCError if the lookup-queue is full.
+		"""
+		if self.isAddress(host):
+			return host
+		
+		return self._lookup(self.resolve, host, False, callback)
+	
+	def addrToName(self, addr, wait=True):
+		"""Returns the host-name of the given IP-address, or the address itself if the lookup fails.
+		With wait=False, an address not in the cache is returned as-is, while it is looked up in the background.
+		"""
+		return self._lookup(self.reverse, addr, wait)
+	
+	def _lookup(self, function, host, wait, callback=None):
+		"""Returns the cached result of function(host), looking it up if necessary"""
+		key = (function, host)
+		now = time.monotonic()
+		with self._cond:
+			entry = self._cache.get(key)
+			if entry != None:
+				self._cache.move_to_end(key)
+				if entry[1] > now:
+					return entry[0]
+			
+			if (entry != None and self.background_refresh) or not wait:
+				queued = self._enqueue(key, callback)
+				if entry != None:
+					return entry[0]
+				if callback == None:
+					return host
+				if not queued:
+					raise OSCError("Too many pending host-name lookups; can't look up '%s'" % host)
+				return None
+		
+		return self._refresh(key)
+	
+	def _enqueue(self, key, callback):
+		"""Queue a lookup for the worker-thread. Must be called holding the lock.
+		Returns False if the queue is full"""
+		callbacks = self._pending.get(key)
+		if callbacks == None:
+			if len(self._pending) >= self.max_pending:
+				self.dropped += 1
+				return False
+			
+			callbacks = []
+			self._pending[key] = callbacks
+			self._queue.append(key)
+			if self._thread == None:
+				self._thread = threading.Thread(target=self._run, name=self.__class__.__name__)
+				self._thread.daemon = True
+				self._thread.start()
+			self._cond.notify()
+		
+		if callback != None:
+			callbacks.append(callback)
+		
+		return True
+	
+	def _run(self):
+		"""Worker-thread main loop"""
+		while True:
+			with self._cond:
+				while not len(self._queue):
+					self._cond.wait()
+				
+				key = self._queue.popleft()
+				if key not in self._pending:
+					continue	# already looked up by a blocking call
+			
+			self._refresh(key)
+	
+	def _refresh(self, key):
+		"""Look up & cache function(host) for the given (function, host) key, and call the callbacks
+		waiting for it. Returns the result"""
+		(function, host) = key
+		self.lookups += 1
+		try:
+			result = function(host)
+			expires = time.monotonic() + self.ttl
+		except (socket.error, UnicodeError):
+			result = host
+			expires = time.monotonic() + self.negative_ttl
+		
+		with self._cond:
+			self._cache[key] = (result, expires)
+			self._cache.move_to_end(key)
+			while len(self._cache) > self.max_entries:
+				self._cache.popitem(last=False)
+			callbacks = self._pending.pop(key, ())
+		
+		for callback in callbacks:
+			try:
+				callback(result)
+			except Exception:
+				import traceback
+				sys.stderr.write("%s: exception in lookup-callback %s\n" % (self.__class__.__name__, repr(callback)))
+				traceback.print_exc()
+		
+		return result
+	
+	def getStats(self):
+		"""Returns a dict with the number of 'cached' & 'pending' lookups, the number of 'lookups' done,
+		and the number of lookups 'dropped' because the queue was full
+		"""
+		with self._cond:
+			return {'cached':len(self._cache), 'pending':len(self._pending), 'lookups':self.lookups, 'dropped':self.dropped}
+	
+	def clear(self):
+		"""Forget all cached lookups
+		"""
+		with self._cond:
+			self._cache.clear()
+
+# The resolver used by the OSC clients & servers
+resolver = OSCResolver()
+
+def setResolver(new_resolver):
+	"""Replace the (module-level) resolver used by the OSC clients & servers,
+	e.g. by an OSCResolver with stub lookup-functions for testing
+	"""
+	global resolver
+	resolver = new_resolver
+
+def parseUrlStr(url, resolve=True):
 	"""Convert provided string in 'host:port/prefix' format to it's components
 	Returns ((host, port), prefix)
+	With resolve=False, the host is returned as given, instead of being resolved to an IP-address.
 	"""
 	if not (isinstance(url,str) and len(url)):
 		return (None, '')
@@ -1014,11 +1317,8 @@ def parseUrlStr(url):
 	if len(head) and not len(host):
 		host = head
 
-	if len(host):
-		try:
-			host = socket.gethostbyname(host)
-		except socket.error:
-			pass
+	if len(host) and resolve:
+		host = resolver.nameToAddr(host)
 
 	try:
 		port = int(portstr)
@@ -1038,6 +1338,9 @@ class OSCClient(object):
 	"""
 	# set outgoing socket buffer size
 	sndbuf_size = 4096 * 8
+	
+	# the maximum number of resolved addresses cached, see _resolve()
+	max_resolved = 1024
 
 	def __init__(self, server=None):
 		"""Construct an OSC Client.
@@ -1045,6 +1348,11 @@ class OSCClient(object):
 		  If none is supplied, a socket will be created.
 		"""
 		self.socket = None
+		self.multicast_options = None
+		self.sequencing = None
+		self._sequences = {}		# destination -> next sequence-number
+		self._resolved = collections.OrderedDict()	# (host, port) -> (resolved socket-address, expiry-time), see _resolve()
+		self.pacer = None
 		self.setServer(server)
 		self.client_address = None
 
@@ -1055,17 +1363,76 @@ class OSCClient(object):
 		self.socket = skt
 		self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.sndbuf_size)
 		self._fd = self.socket.fileno()
+		if self.multicast_options != None:
+			self._applyMulticastOptions()
 
-	def _ensureConnected(self, address):
-		"""Make sure client has a socket connected to address"""
+	def _ensureSocket(self, address_family=socket.AF_INET):
+		"""Make sure client has a socket"""
 		if not self.socket:
-			if len(address) == 4:
-				address_family = socket.AF_INET6
-			else:
-				address_family = socket.AF_INET
 			self._setSocket(socket.socket(address_family, socket.SOCK_DGRAM))
+
+	def _ensureConnected(self, address):
+		"""Make sure client has a socket connected to address"""
+		if len(address) == 4:
+			self._ensureSocket(socket.AF_INET6)
+		else:
+			self._ensureSocket(socket.AF_INET)
 		self.socket.connect(address)
 		
+	def setMulticastOptions(self, ttl=1, loopback=True, interface=None):
+		"""Configure the Client's socket for sending to (IPv4) multicast groups.
+		To send to a group, simply connect() or sendto() the group's (address, port).
+		  - ttl (int): the number of hops multicast packets may travel. 1 (default) keeps them on the local network.
+		  - loopback (bool): if True, packets sent to a group are also delivered to group-members on this host.
+		  - interface (string): the IP-address of the local interface to send from.
+		  If None (default), the kernel chooses the interface.
+		The options are kept, and re-applied when the Client's socket changes (e.g. by setServer())
+		"""
+		self.multicast_options = (ttl, loopback, interface)
+		if self.socket:
+			self._applyMulticastOptions()
+		else:
+			self._ensureSocket()	# this applies the options
+		
+	def _applyMulticastOptions(self):
+		"""Apply the stored multicast options to the Client's socket"""
+		(ttl, loopback, interface) = self.multicast_options
+		try:
+			self.socket.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, ttl)
+			self.socket.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, int(bool(loopback)))
+			if interface != None:
+				self.socket.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(interface))
+		except socket.error as e:
+			raise OSCClientError("while setting multicast options: %s" % str(e))
+		
+	def setSequencing(self, mode='bundle'):
+		"""Number the packets sent to each destination, so the receiver can detect lost,
+		duplicate & reordered packets (see OSCSequenceTracker).
+		  - mode ('bundle' | 'argument' | None): 'bundle' wraps each packet in a bundle with a '/_seq <int>' message,
+		  'argument' appends the number to each OSCMessage as a trailing int argument (bundles are still wrapped).
+		  None (or False) disables sequencing.
+		"""
+		if mode and (mode not in ('bundle', 'argument')):
+			raise ValueError("invalid sequencing mode %s" % repr(mode))
+		
+		self.sequencing = mode or None
+		self._sequences = {}
+		
+	def _sequenced(self, msg, address):
+		"""Returns the given message, numbered for the given destination"""
+		seq = self._sequences.get(address, 0)
+		self._sequences[address] = (seq + 1) % OSCSequenceTracker.modulus
+		
+		if (self.sequencing == 'argument') and not isinstance(msg, OSCBundle):
+			msg = msg.copy()
+			msg.append(seq, 'i')
+			return msg
+		
+		wrapper = OSCBundle()
+		wrapper.append(OSCMessage(OSCSequenceTracker.address, seq))
+		wrapper.append(msg)
+		return wrapper
+		
 	def setServer(self, server):
 		"""Associate this Client with given server.
 		The Client will send from the Server's socket.
@@ -1092,8 +1459,12 @@ class OSCClient(object):
 		self.server.client = self
 
 	def close(self):
-		"""Disconnect & close the Client's socket
+		"""Disconnect & close the Client's socket. Packets still waiting to be paced out are discarded.
 		"""
+		if self.pacer != None:
+			self.pacer.close()
+			self.pacer = None
+		
 		if self.socket != None:
 			self.socket.close()
 			self.socket = None
@@ -1171,29 +1542,115 @@ class OSCClient(object):
 		  - timeout:  A timeout value for attempting to send. If timeout == None,
 		  	this call blocks until socket is available for writing. 
 		Raises OSCClientError when timing out while waiting for the socket. 
+		The message is sent without connecting the socket, so this doesn't disturb the address
+		the Client is connected to, or the socket of an OSCServer the Client sends replies for.
 		"""
 		if not isinstance(msg, OSCMessage):
 			raise TypeError("'msg' argument is not an OSCMessage or OSCBundle object")
 
-		ret = select.select([],[self._fd], [], timeout)
+		if self.sequencing:
+			msg = self._sequenced(msg, address)
+
+		self._sendBinary(msg.getBinary(), address, timeout)
+
+	def _resolve(self, address):
+		"""Returns the resolved socket-address for the given (host, port) tuple, creating the Client's socket
+		(of the matching address-family) if it doesn't have one yet. The 'max_resolved' most recently used
+		resolved addresses are cached; those of host-names expire with the resolver's 'ttl'.
+		"""
 		try:
-			ret[1].index(self._fd)
-		except:
-			# for the very rare case this might happen
-			raise OSCClientError("Timed out waiting for file descriptor")
+			(resolved, expires) = self._resolved[address]
+			if expires > time.monotonic():
+				self._resolved.move_to_end(address)
+				return resolved
+		except KeyError:
+			pass
+		
+		if len(address) == 4:
+			family = socket.AF_INET6
+		elif self.socket:
+			family = self.socket.family
+		else:
+			family = socket.AF_INET
+		
+		(resolved, expires) = self._lookup(address, family)
+		self._ensureSocket(family)
 		
+		self._resolved[address] = (resolved, expires)
+		self._resolved.move_to_end(address)
+		if len(self._resolved) > self.max_resolved:
+			self._resolved.popitem(last=False)
+		return resolved
+	
+	def _lookup(self, address, family):
+		"""Returns the (resolved socket-address, expiry-time) for the given (host, port) tuple"""
+		host = address[0]
+		if resolver.isAddress(host):
+			expires = float('inf')
+		else:
+			if family == socket.AF_INET:
+				host = resolver.nameToAddr(host)
+			expires = time.monotonic() + resolver.ttl
+		
+		return (socket.getaddrinfo(host, address[1], family, socket.SOCK_DGRAM)[0][4], expires)
+
+	def setPacing(self, pps=None, bps=None, burst=0.001):
+		"""Pace the packets sent to each destination, so bursts don't overrun the receivers' buffers (see OSCSendPacer).
+		  - pps (float): the maximum number of packets per second sent to each destination.
+		  - bps (float): the maximum number of bytes per second sent to each destination.
+		  - burst (float): how many seconds' worth of packets may be sent back-to-back.
+		When both 'pps' & 'bps' are None (default), pacing is disabled, and packets still waiting are discarded.
+		"""
+		if self.pacer != None:
+			self.pacer.close()
+			self.pacer = None
+		
+		if (pps != None) or (bps != None):
+			self.pacer = OSCSendPacer(self._writeBinary, pps, bps, burst)
+	
+	def getPacingStats(self):
+		"""Returns the pacer's statistics per destination (see OSCSendPacer.getStats()),
+		or an empty dict if pacing is disabled
+		"""
+		if self.pacer == None:
+			return {}
+		
+		return self.pacer.getStats()
+	
+	def _sendBinary(self, binary, address=None, timeout=None):
+		"""Send a binary OSC-packet to the given (host, port) address, or to the connected address if None.
+		All sending goes through here. With pacing enabled (see setPacing()), the packet is handed
+		to the pacer, which writes it now or later; otherwise it is written straight away.
+		"""
+		if self.pacer != None:
+			self.pacer.put(binary, address, timeout)
+		else:
+			self._writeBinary(binary, address, timeout)
+	
+	def _writeBinary(self, binary, address=None, timeout=None):
+		"""Write a binary OSC-packet to the given (host, port) address, or to the connected address if None.
+		Writing to an address uses an unconnected sendto(), to a cached, resolved socket-address.
+		The socket is only select()ed for writing if a 'timeout' is given.
+		Raises OSCClientError when timing out while waiting for the socket.
+		"""
 		try:
-			self._ensureConnected(address)
-			self.socket.sendall(msg.getBinary())
+			if address != None:
+				target = self._resolve(address)
+			
+			if timeout != None:
+				if not select.select([], [self._fd], [], timeout)[1]:
+					raise OSCClientError("Timed out waiting for file descriptor")
 			
-			if self.client_address:
-				self.socket.connect(self.client_address)
+			if address != None:
+				self.socket.sendto(binary, target)
+			else:
+				self.socket.send(binary)
 			
 		except socket.error as e:
-			if e[0] in (7, 65):	# 7 = 'no address associated with nodename',  65 = 'no route to host'
+			if e.errno in (7, 65):	# 7 = 'no address associated with nodename',  65 = 'no route to host'
 				raise e
 			else:
-				raise OSCClientError("while sending to %s: %s" % (str(address), str(e)))
+				raise OSCClientError("while sending to %s: %s" % (str(address or self.client_address), str(e)))
 
 	def send(self, msg, timeout=None):
 		"""Send the given OSCMessage.
@@ -1210,20 +1667,138 @@ class OSCClient(object):
 		if not self.socket:
 			raise OSCClientError("Called send() on non-connected client")
 
-		ret = select.select([],[self._fd], [], timeout)
+		if self.sequencing:
+			msg = self._sequenced(msg, self.client_address)
+
+		self._sendBinary(msg.getBinary(), None, timeout)
+
+	def sendClockSync(self, address="/clock", timeout=None):
+		"""Send a clock-sync message: a message holding this host's current time as a timetag,
+		for the receiving OSCServer's clock-estimator (see OSCServer.setClockEstimation()).
+		The Client must be already connected.
+		"""
+		msg = OSCMessage(address)
+		msg.append(NTPTime.now())
+		self.send(msg, timeout)
+
+class OSCPooledClient(OSCClient):
+	"""OSC Client sending to each destination from its own, connected socket, kept in a pool.
+	Sending over a connected socket spares the kernel an address- & route-lookup per packet, and reports
+	errors (e.g. 'connection refused') for the destination they belong to. The pool holds at most 'max_sockets'
+	sockets; the least-recently used one is closed to make room, and sockets left unused for 'idle_timeout'
+	seconds are closed as well. Note that each pooled socket sends from its own (ephemeral) port.
+	(A plain OSCClient sends to any number of destinations from a single, unconnected socket.)
+	"""
+	# the default pool-size & idle-timeout (in seconds)
+	max_sockets = 64
+	idle_timeout = 60.
+	
+	def __init__(self, max_sockets=None, idle_timeout=None):
+		"""Construct an OSCPooledClient.
+		  - max_sockets (int), idle_timeout (float): override the class defaults.
+		"""
+		OSCClient.__init__(self)
+		if max_sockets != None:
+			self.max_sockets = max_sockets
+		if idle_timeout != None:
+			self.idle_timeout = idle_timeout
+		
+		self._pool = collections.OrderedDict()	# (host, port) -> [socket, expiry-time, last-used time], least-recently used first
+		self._next_sweep = 0.
+		self.opened = 0
+		self.evicted = 0
+		self.expired = 0
+	
+	def _pooledSocket(self, address):
+		"""Returns the pooled socket connected to the given (host, port) address, opening it if necessary"""
+		now = time.monotonic()
+		if now >= self._next_sweep:
+			self._closeIdle(now)
+		
+		pool = self._pool
+		entry = pool.get(address)
+		if entry != None:
+			pool.move_to_end(address)
+			entry[2] = now
+			if entry[1] > now:
+				return entry[0]
+			
+			# the resolved address expired; re-resolve & reconnect
+			(target, entry[1]) = self._lookup(address, entry[0].family)
+			entry[0].connect(target)
+			return entry[0]
+		
+		if len(address) == 4:
+			family = socket.AF_INET6
+		else:
+			family = socket.AF_INET
+		
+		(target, expires) = self._lookup(address, family)
+		skt = socket.socket(family, socket.SOCK_DGRAM)
 		try:
-			ret[1].index(self._fd)
-		except:
-			# for the very rare case this might happen
-			raise OSCClientError("Timed out waiting for file descriptor")
+			skt.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.sndbuf_size)
+			skt.connect(target)
+		except socket.error:
+			skt.close()
+			raise
+		
+		pool[address] = [skt, expires, now]
+		self.opened += 1
+		if len(pool) > self.max_sockets:
+			pool.popitem(last=False)[1][0].close()
+			self.evicted += 1
+		
+		return skt
+	
+	def _closeIdle(self, now):
+		"""Close the pooled sockets left unused for 'idle_timeout' seconds"""
+		pool = self._pool
+		deadline = now - self.idle_timeout
+		while len(pool):
+			(address, entry) = next(iter(pool.items()))
+			if entry[2] > deadline:
+				break
+			
+			del pool[address]
+			entry[0].close()
+			self.expired += 1
+		
+		self._next_sweep = now + (self.idle_timeout / 4.)
+	
+	def _writeBinary(self, binary, address=None, timeout=None):
+		"""Write a binary OSC-packet to the given (host, port) address from its pooled socket,
+		or to the connected address if None (see OSCClient._writeBinary()).
+		"""
+		if address == None:
+			return OSCClient._writeBinary(self, binary, None, timeout)
 		
 		try:
-			self.socket.sendall(msg.getBinary())
+			skt = self._pooledSocket(address)
+			if timeout != None:
+				if not select.select([], [skt], [], timeout)[1]:
+					raise OSCClientError("Timed out waiting for file descriptor")
+			
+			skt.send(binary)
+			
 		except socket.error as e:
-			if e[0] in (7, 65):	# 7 = 'no address associated with nodename',  65 = 'no route to host'
+			if e.errno in (7, 65):	# 7 = 'no address associated with nodename',  65 = 'no route to host'
 				raise e
 			else:
-				raise OSCClientError("while sending: %s" % str(e))
+				raise OSCClientError("while sending to %s: %s" % (str(address), str(e)))
+	
+	def getPoolStats(self):
+		"""Returns a dict with the number of pooled 'sockets', and the number of sockets 'opened' so far,
+		'evicted' to make room, and 'expired' after being idle
+		"""
+		return {'sockets':len(self._pool), 'opened':self.opened, 'evicted':self.evicted, 'expired':self.expired}
+	
+	def close(self):
+		"""Close the Client's own socket, and all pooled sockets
+		"""
+		OSCClient.close(self)
+		for entry in self._pool.values():
+			entry[0].close()
+		self._pool.clear()
 
 ######
 #
@@ -1304,6 +1879,7 @@ def getFilterStr(filters):
 # A translation-table for mapping OSC-address expressions to Python 're' expressions
 OSCtrans = str.maketrans("{,}?","(|).")
 
+@functools.lru_cache(maxsize=1024)
 def getRegEx(pattern):
 	"""Compiles and returns a 'regular expression' object for the given address-pattern.
 	"""
@@ -1327,7 +1903,17 @@ class OSCMultiClient(OSCClient):
 	This client keeps a dict of 'OSCTargets'. and sends each OSCMessage to each OSCTarget
 	The OSCTargets are simply (host, port) tuples, and may be associated with an OSC-address prefix.
 	the OSCTarget's prefix gets prepended to each OSCMessage sent to that target.
+	
+	For each OSC-address sent to, the client keeps an index of the OSCTargets whose filters pass that address.
+	The index is updated incrementally when OSCTargets are added, changed or deleted, so sending only
+	costs time for the OSCTargets that receive the message. Always change the OSCTargets through the
+	methods provided (not by modifying the 'targets' dict directly), or the index gets out of date.
 	"""
+	# the maximum number of OSC-addresses kept in the index; when full, the least-recently sent-to address is dropped
+	max_routes = 4096
+	# the maximum number of cached filter-match results (see _matchFilters()), least-recently used dropped first
+	max_match_cache = 4096
+	
 	def __init__(self, server=None):
 		"""Construct a "Multi" OSC Client.
 		  - server: Local OSCServer-instance this client will use the socket of for transmissions.
@@ -1336,15 +1922,15 @@ class OSCMultiClient(OSCClient):
 		super(OSCMultiClient, self).__init__(server)
 		
 		self.targets = {}
+		self._target_filters = {}	# (host, port) -> compiled filters, see _compileFilters()
+		self._match_cache = collections.OrderedDict()	# (compiled filters, OSC-address) -> bool, LRU first
+		self._routes = collections.OrderedDict()		# OSC-address -> {(host, port):None} for the OSCTargets passing it, LRU first
 		
 	def _searchHostAddr(self, host):
 		"""Search the subscribed OSCTargets for (the first occurence of) given host.
 		Returns a (host, port) tuple
 		"""
-		try:
-			host = socket.gethostbyname(host)
-		except socket.error:
-			pass
+		host = resolver.nameToAddr(host)
 		
 		for addr in list(self.targets.keys()):
 			if host == addr[0]:
@@ -1392,6 +1978,71 @@ class OSCMultiClient(OSCClient):
 				raise TypeError("'filters' argument must be a dict with {addr:bool} entries")
 		
 			self._updateFilters(self.targets[address][1], filters)
+		
+		self._targetChanged(address)
+		
+	def _compileFilters(self, filters):
+		"""Returns the given 'filters' dict compiled to a hashable (default, ((addr, bool), ...)) tuple,
+		or None if there are no filters (i.e. everything passes).
+		Targets with the same filters get equal compiled filters, so they can share filtering-results.
+		"""
+		if not len(filters):
+			return None
+		
+		if '/*' in filters:
+			default = filters['/*']
+		else:
+			default = False in list(filters.values())
+		
+		return (default, tuple([(addr, bool) for (addr, bool) in list(filters.items()) if addr != '/*']))
+	
+	def _targetChanged(self, address):
+		"""Recompile the filters of the given OSCTarget after it was added, changed or deleted,
+		and update the OSC-address index accordingly
+		"""
+		if address in self.targets:
+			compiled = self._target_filters[address] = self._compileFilters(self.targets[address][1])
+			for (addr, targets) in list(self._routes.items()):
+				if (compiled == None) or self._matchFilters(compiled, addr):
+					targets[address] = None
+				else:
+					targets.pop(address, None)
+		else:
+			self._target_filters.pop(address, None)
+			for targets in list(self._routes.values()):
+				targets.pop(address, None)
+	
+	def _route(self, addr):
+		"""Returns the OSCTargets (as a {(host, port):None} dict) whose filters pass the given OSC-address.
+		Addresses not in the index yet are looked up in all OSCTargets, and added to the index.
+		"""
+		targets = self._routes.get(addr)
+		if targets != None:
+			self._routes.move_to_end(addr)
+			return targets
+		
+		targets = {}
+		for (address, (prefix, filters)) in list(self.targets.items()):
+			try:
+				compiled = self._target_filters[address]
+			except KeyError:
+				compiled = self._target_filters[address] = self._compileFilters(filters)
+			
+			if (compiled == None) or self._matchFilters(compiled, addr):
+				targets[address] = None
+		
+		if len(self._routes) >= self.max_routes:
+			self._routes.popitem(last=False)
+		self._routes[addr] = targets
+		return targets
+	
+	def _routeElements(self, elements, targets):
+		"""Collect the OSCTargets receiving any of the given bundle-elements (see _splitBundle()) into 'targets'"""
+		for (addr, _, elements) in elements:
+			if elements == None:
+				targets.update(self._route(addr))
+			else:
+				self._routeElements(elements, targets)
 			
 	def setOSCTarget(self, address, prefix=None, filters=None):
 		"""Add (i.e. subscribe) a new OSCTarget, or change the prefix for an existing OSCTarget.
@@ -1405,11 +2056,7 @@ class OSCMultiClient(OSCClient):
 				
 		elif (isinstance(address,tuple)):
 			(host, port) = address[:2]
-			try:
-				host = socket.gethostbyname(host)
-			except:
-				pass
-				
+			host = resolver.nameToAddr(host)
 			address = (host, port)
 		else:
 			raise TypeError("'address' argument must be a (host, port) tuple or a 'host' string")
@@ -1436,6 +2083,8 @@ class OSCMultiClient(OSCClient):
 				del self.targets[address]
 		except KeyError:
 			raise NotSubscribedError(address, prefix)
+		
+		self._targetChanged(address)
 
 	def delOSCTarget(self, address, prefix=None):
 		"""Delete the specified OSCTarget from the Client's dict.
@@ -1447,10 +2096,7 @@ class OSCMultiClient(OSCClient):
 
 		if isinstance(address,tuple):
 			(host, port) = address[:2]
-			try:
-				host = socket.gethostbyname(host)
-			except socket.error:
-				pass
+			host = resolver.nameToAddr(host)
 			address = (host, port)
 			
 			self._delTarget(address, prefix)
@@ -1465,10 +2111,7 @@ class OSCMultiClient(OSCClient):
 
 		if isinstance(address,tuple):
 			(host, port) = address[:2]
-			try:
-				host = socket.gethostbyname(host)
-			except socket.error:
-				pass
+			host = resolver.nameToAddr(host)
 			address = (host, port)
 			
 			if address in list(self.targets.keys()):
@@ -1484,11 +2127,7 @@ class OSCMultiClient(OSCClient):
 		"""
 		out = {}
 		for ((host, port), pf) in list(self.targets.items()):
-			try:
-				(host, _, _) = socket.gethostbyaddr(host)
-			except socket.error:
-				pass
-
+			host = resolver.addrToName(host)
 			out[(host, port)] = pf
 				
 		return out
@@ -1503,18 +2142,11 @@ class OSCMultiClient(OSCClient):
 
 		if (isinstance(address,tuple)): 
 			(host, port) = address[:2]
-			try:
-				host = socket.gethostbyname(host)
-			except socket.error:
-				pass
+			host = resolver.nameToAddr(host)
 			address = (host, port)
 					
 			if (address in list(self.targets.keys())):
-				try:
-					(host, _, _) = socket.gethostbyaddr(host)
-				except socket.error:
-					pass
-	
+				host = resolver.addrToName(host)
 				return ((host, port), self.targets[address])
 
 		return (None, ['',{}])
@@ -1523,6 +2155,8 @@ class OSCMultiClient(OSCClient):
 		"""Erases all OSCTargets from the Client's dict
 		"""
 		self.targets = {}
+		self._target_filters = {}
+		self._routes.clear()
 			
 	def updateOSCTargets(self, dict):
 		"""Update the Client's OSCTargets dict with the contents of 'dict'
@@ -1533,23 +2167,27 @@ class OSCMultiClient(OSCClient):
 			val = [prefix, {}]
 			self._updateFilters(val[1], filters)
 			
-			try:
-				host = socket.gethostbyname(host)
-			except socket.error:
-				pass
-				
+			host = resolver.nameToAddr(host)
 			self.targets[(host, port)] = val
+			self._targetChanged((host, port))
 
 	def getOSCTargetStr(self, address):
 		"""Returns the OSCTarget matching the given address as a ('osc://<host>:<port>[<prefix>]', ['<filter-string>', ...])' tuple.
 		'address' can be a (host, port) tuple, or a 'host' (string), in which case the first matching OSCTarget is returned
 		Returns (None, []) if address not found.
+		Like getOSCTargetStrings(), this gives the target's host-name only if the resolver has it cached,
+		so it doesn't wait on a reverse DNS-lookup (see getUrlStr()).
 		"""
-		(addr, (prefix, filters)) = self.getOSCTarget(address)
-		if addr == None:
-			return (None, [])
+		if isinstance(address,str):
+			address = self._searchHostAddr(address)
+
+		if isinstance(address,tuple):
+			address = (resolver.nameToAddr(address[0]), address[1])
+			if address in self.targets:
+				(prefix, filters) = self.targets[address]
+				return ("osc://%s" % getUrlStr(address, prefix), getFilterStr(filters))
 
-		return ("osc://%s" % getUrlStr(addr, prefix), getFilterStr(filters))
+		return (None, [])
 			
 	def getOSCTargetStrings(self):
 		"""Returns a list of all OSCTargets as ('osc://<host>:<port>[<prefix>]', ['<filter-string>', ...])' tuples.
@@ -1578,6 +2216,87 @@ class OSCMultiClient(OSCClient):
 		"""
 		self.send(msg, timeout)
 
+	def _matchFilters(self, compiled, address):
+		"""Returns True if an OSCMessage with the given OSC-address passes the given compiled filters
+		(see _compileFilters()). Results are cached.
+		"""
+		key = (compiled, address)
+		out = self._match_cache.get(key)
+		if out != None:
+			self._match_cache.move_to_end(key)
+			return out
+		
+		(out, entries) = compiled
+		expr = getRegEx(address)
+		for (addr, bool) in entries:
+			match = expr.match(addr)
+			if match and (match.end() == len(addr)):
+				out = bool
+				break
+		
+		if len(self._match_cache) >= self.max_match_cache:
+			self._match_cache.popitem(last=False)
+		self._match_cache[key] = out
+		return out
+	
+	def _splitBundle(self, binary):
+		"""Split a binary OSC-bundle into a list of its elements, without decoding them.
+		Messages become (OSC-address, binary, None) tuples, and bundles become
+		("#bundle", header, [elements]) tuples, where 'header' holds the '#bundle' string & timetag.
+		"""
+		out = []
+		rest = binary[16:]
+		while len(rest) >= 4:
+			size = struct.unpack(">i", rest[:4])[0]
+			element = rest[4:size + 4]
+			rest = rest[size + 4:]
+			if element.startswith(b"#bundle"):
+				out.append(("#bundle", element[:16], self._splitBundle(element)))
+			else:
+				out.append((_readString(element)[0], element, None))
+		
+		return out
+	
+	def _filterElements(self, compiled, elements):
+		"""Returns the binaries (size-prefixed, for inclusion in a bundle) of the given bundle-elements
+		(see _splitBundle()) that pass the given compiled filters. Bundles left empty are left out.
+		"""
+		out = []
+		for (address, binary, elements) in elements:
+			if elements == None:
+				if not self._matchFilters(compiled, address):
+					continue
+			else:
+				contents = self._filterElements(compiled, elements)
+				if not len(contents):
+					continue
+				binary += b"".join(contents)
+			
+			out.append(struct.pack(">i", len(binary)) + binary)
+		
+		return out
+	
+	def _targetBinary(self, compiled, prefix, msg, binary, elements):
+		"""Returns the binary to send to an OSCTarget with the given compiled filters & prefix,
+		or None if nothing passes the filters.
+		  - msg: the OSCMessage (or OSCBundle) being sent, and 'binary' its encoded form.
+		  - elements: the result of _splitBundle(binary) if 'msg' is an OSCBundle, else None.
+		"""
+		if compiled != None:
+			if elements == None:
+				if not self._matchFilters(compiled, msg.address):
+					return None
+			else:
+				contents = self._filterElements(compiled, elements)
+				if not len(contents):
+					return None
+				binary = binary[:16] + b"".join(contents)
+		
+		if len(prefix):
+			binary = self._prefixBinary(prefix, binary)
+		
+		return binary
+
 	def _filterMessage(self, filters, msg):
 		"""Checks the given OSCMessge against the given filters.
 		'filters' is a dict containing OSC-address:bool pairs.
@@ -1634,10 +2353,7 @@ class OSCMultiClient(OSCClient):
 		out = msg.copy()
 		
 		if isinstance(msg, OSCBundle):
-			msgs = list(out.values())
-			out.clearData()
-			for m in msgs:
-				out.append(self._prefixAddress(prefix, m))
+			out.message = self._prefixBinary(prefix, msg.getBinary())[16:]
 
 		elif isinstance(msg, OSCMessage):
 			out.setAddress(prefix + out.address)
@@ -1646,6 +2362,25 @@ class OSCMultiClient(OSCClient):
 			raise TypeError("'msg' argument is not an OSCMessage or OSCBundle object")
 		
 		return out
+	
+	def _prefixBinary(self, prefix, binary):
+		"""Prepends the given prefix to the OSC-address of the given binary OSC-message,
+		or to those of all messages in the given binary OSC-bundle (recursively).
+		Only the (padded) address-strings are rewritten; typetags, arguments & timetags are reused as-is.
+		"""
+		if not binary.startswith(b"#bundle"):
+			length = binary.find(b'\0')
+			return OSCString(prefix + binary[:length].decode('latin1')) + binary[(length + 4) & ~3:]
+		
+		out = [binary[:16]]
+		rest = binary[16:]
+		while len(rest) >= 4:
+			size = struct.unpack(">i", rest[:4])[0]
+			element = self._prefixBinary(prefix, rest[4:size + 4])
+			rest = rest[size + 4:]
+			out.append(struct.pack(">i", len(element)) + element)
+		
+		return b"".join(out)
 
 	def send(self, msg, timeout=None):
 		"""Send the given OSCMessage to all subscribed OSCTargets
@@ -1654,40 +2389,51 @@ class OSCMultiClient(OSCClient):
 		  	this call blocks until socket is available for writing. 
 		Raises OSCClientError when timing out while waiting for	the socket.
 		"""
-		for (address, (prefix, filters)) in list(self.targets.items()):
-			if len(filters):
-				out = self._filterMessage(filters, msg)
-				if not out:			# this catches 'None' and empty bundles.
-					continue
-			else:
-				out = msg
-
-			if len(prefix):
-				out = self._prefixAddress(prefix, msg)
-
-			binary = out.getBinary()
-			
-			ret = select.select([],[self._fd], [], timeout)
-			try:
-				ret[1].index(self._fd)
-			except:
-				# for the very rare case this might happen
-				raise OSCClientError("Timed out waiting for file descriptor")
-			
-			try:
-				while len(binary):
-					sent = self.socket.sendto(binary, address)
-					binary = binary[sent:]
-				
-			except socket.error as e:
-				if e[0] in (7, 65):	# 7 = 'no address associated with nodename',  65 = 'no route to host'
-					raise e
-				else:
-					raise OSCClientError("while sending to %s: %s" % (str(address), str(e)))
+		if not isinstance(msg, OSCMessage):
+			raise TypeError("'msg' argument is not an OSCMessage or OSCBundle object")
+		
+		binary = msg.getBinary()
+		if isinstance(msg, OSCBundle):
+			elements = self._splitBundle(binary)
+			targets = {}
+			self._routeElements(elements, targets)
+		else:
+			elements = None
+			targets = self._route(msg.address)
+		
+		# targets with the same filters & prefix get the same binary, which is built only once
+		outputs = {}
+		for address in list(targets.keys()):
+			prefix = self.targets[address][0]
+			key = (self._target_filters[address], prefix)
+			try:
+				out = outputs[key]
+			except KeyError:
+				out = outputs[key] = self._targetBinary(key[0], prefix, msg, binary, elements)
+			
+			if out != None:
+				self._sendBinary(out, address, timeout)
+
+def _kernelTimestamp(ancdata):
+	"""Returns the SO_TIMESTAMPNS arrival-time found in the given
+	ancillary data (from socket.recvmsg()) in integer nanoseconds since the Epoch,
+	or None if not found.
+	"""
+	for (level, kind, data) in ancdata:
+		if (level == socket.SOL_SOCKET) and (kind == SO_TIMESTAMPNS):
+			(secs, nsecs) = _timespec.unpack_from(data)
+			return secs * 1000000000 + nsecs
+	
+	return None
+
+# struct timespec, as found in SO_TIMESTAMPNS ancillary data
+_timespec = struct.Struct("@ll")
+_timespec_cmsg_size = socket.CMSG_SPACE(_timespec.size)
 
 class OSCAddressSpace:
 	def __init__(self):
 		self.callbacks = {}
+		self._timestamp_callbacks = set()	# addresses whose callback accepts a 'timestamp' argument
 	def addMsgHandler(self, address, callback):
 		"""Register a handler for an OSC-address
 		  - 'address' is the OSC address-string. 
@@ -1695,67 +2441,1283 @@ class OSCAddressSpace:
 		  - 'callback' is the function called for incoming OSCMessages that match 'address'.
 		The callback-function will be called with the same arguments as the 'msgPrinter_handler' below
 		"""
-		for chk in '*?,[]{}# ':
-			if chk in address:
-				raise OSCServerError("OSC-address string may not contain any characters in '*?,[]{}# '")
+		for chk in '*?,[]{}# ':
+			if chk in address:
+				raise OSCServerError("OSC-address string may not contain any characters in '*?,[]{}# '")
+		
+		if type(callback) not in (types.FunctionType, types.MethodType):
+			raise OSCServerError("Message callback '%s' is not callable" % repr(callback))
+		
+		if address != 'default':
+			address = '/' + address.strip('/')
+			
+		self.callbacks[address] = callback
+		
+		if self._acceptsTimestamp(callback):
+			self._timestamp_callbacks.add(address)
+		else:
+			self._timestamp_callbacks.discard(address)
+		
+	def _acceptsTimestamp(self, callback):
+		"""Returns True if the given callback accepts a 'timestamp' keyword-argument"""
+		try:
+			params = list(inspect.signature(callback).parameters.values())
+		except (TypeError, ValueError):
+			return False
+		
+		for param in params:
+			if (param.name == 'timestamp') or (param.kind == param.VAR_KEYWORD):
+				return True
+		
+		return False
+		
+	def delMsgHandler(self, address):
+		"""Remove the registered handler for the given OSC-address
+		"""
+		del self.callbacks[address]
+		self._timestamp_callbacks.discard(address)
+	
+	def getOSCAddressSpace(self):
+		"""Returns a list containing all OSC-addresses registerd with this Server. 
+		"""
+		return list(self.callbacks.keys())
+	
+	def dispatchMessage(self, pattern, tags, data, client_address, timestamp=None):
+		"""Attmept to match the given OSC-address pattern, which may contain '*',
+		against all callbacks registered with the OSCServer.
+		Calls the matching callback and returns whatever it returns.
+		If no match is found, and a 'default' callback is registered, it calls that one,
+		or raises NoCallbackError if a 'default' callback is not registered.
+		
+		  - pattern (string):  The OSC-address of the receied message
+		  - tags (string):  The OSC-typetags of the receied message's arguments, without ','
+		  - data (list):  The message arguments
+		  - timestamp (int):  The message's arrival-time in nanoseconds since the Epoch, if known.
+		  This is passed on to callbacks accepting a 'timestamp' keyword-argument.
+		"""
+		if len(tags) != len(data):
+			raise OSCServerError("Malformed OSC-message; got %d typetags [%s] vs. %d values" % (len(tags), tags, len(data)))
+		
+		expr = getRegEx(pattern)
+		
+		replies = []
+		matched = 0
+		for addr in list(self.callbacks.keys()):
+			match = expr.match(addr)
+			if match and (match.end() == len(addr)):
+				self._callHandler(addr, pattern, tags, data, client_address, timestamp, replies)
+				matched += 1
+					
+		if matched == 0:
+			if 'default' in self.callbacks:
+				self._callHandler('default', pattern, tags, data, client_address, timestamp, replies)
+			else:
+				raise NoCallbackError(pattern)
+		
+		return replies
+
+	def _callHandler(self, addr, pattern, tags, data, client_address, timestamp, replies):
+		"""Call the callback registered for 'addr', and append its reply (if any) to 'replies'"""
+		if addr in self._timestamp_callbacks:
+			reply = self.callbacks[addr](pattern, tags, data, client_address, timestamp=timestamp)
+		else:
+			reply = self.callbacks[addr](pattern, tags, data, client_address)
+		
+		if isinstance(reply, OSCMessage):
+			replies.append(reply)
+		elif reply != None:
+			raise TypeError("Message-callback %s did not return OSCMessage or None: %s" % (self.callbacks[addr], type(reply)))
+
+######
+#
+# OSCScheduler class
+#
+######
+
+class OSCScheduler(object):
+	"""Holds timetagged OSC-bundles until they are due.
+	Scheduled items are kept in a heap, ordered by due-time, and are dispatched by a
+	single (daemon) thread. This way, the thread receiving packets never has to
+	wait for a bundle's timetag to come around.
+	For each dispatch, the delay between the item's due-time and the moment it
+	was actually dispatched is recorded (see getLatenessStats()). If a 'lateness_callback'
+	is set, it is called with (lateness, due) after each dispatch.
+	"""
+	# the last 'spin_time' seconds before an item is due are busy-waited, rather than slept,
+	# for sub-millisecond precision (at the cost of some CPU-time)
+	spin_time = 0.
+	
+	def __init__(self):
+		"""Instantiate an OSCScheduler. The dispatcher thread is started on demand.
+		"""
+		self._queue = []
+		self._counter = itertools.count()	# tie-breaker for items due at the same time
+		self._cond = threading.Condition()
+		self._thread = None
+		self.running = False
+		self.stopped = False
+		self.lateness_callback = None
+		self.resetLatenessStats()
+
+	def start(self):
+		"""Start the dispatcher thread, if it isn't running already (and the scheduler wasn't stopped)
+		"""
+		with self._cond:
+			if self.running or self.stopped:
+				return
+			
+			self.running = True
+			self._thread = threading.Thread(target=self._run, name=self.__class__.__name__)
+			self._thread.daemon = True
+			self._thread.start()
+
+	def stop(self):
+		"""Stop the dispatcher thread. Items still pending are discarded,
+		and items scheduled from now on are ignored.
+		"""
+		with self._cond:
+			self.running = False
+			self.stopped = True
+			self._queue = []
+			self._cond.notify()
+		
+		if self._thread and (self._thread != threading.current_thread()):
+			self._thread.join()
+		
+		self._thread = None
+
+	def schedule(self, due, callback, *args):
+		"""Call 'callback(*args)' from the dispatcher thread at time 'due'
+		(floating seconds since the Epoch). Items due at the same time are
+		dispatched in the order they were scheduled.
+		Returns False (and ignores the item) if the scheduler was stopped.
+		"""
+		with self._cond:
+			if self.stopped:
+				return False
+			heapq.heappush(self._queue, (due, next(self._counter), callback, args))
+			self._cond.notify()
+		
+		if not self.running:
+			self.start()
+		return True
+
+	def pending(self):
+		"""Returns the number of items waiting to be dispatched
+		"""
+		return len(self._queue)
+
+	def resetLatenessStats(self):
+		"""Clear the recorded dispatch-lateness statistics
+		"""
+		self.dispatched = 0
+		self.lateness_total = 0.
+		self.lateness_max = 0.
+		self.lateness_last = 0.
+
+	def getLatenessStats(self):
+		"""Returns a dict with the number of dispatched items, and the last, mean and maximum
+		delay (in seconds) between the items' due-time and their actual dispatch
+		"""
+		if self.dispatched:
+			mean = self.lateness_total / self.dispatched
+		else:
+			mean = 0.
+		
+		return {'dispatched':self.dispatched, 'last':self.lateness_last, 'mean':mean, 'max':self.lateness_max}
+
+	def _run(self):
+		"""Dispatcher thread main loop"""
+		while True:
+			with self._cond:
+				while self.running:
+					if not len(self._queue):
+						self._cond.wait()
+						continue
+					
+					delay = self._queue[0][0] - time.time()
+					if delay <= 0:
+						break
+					
+					if delay > self.spin_time:
+						self._cond.wait(delay - self.spin_time)
+					else:
+						# busy-wait, but let other threads schedule items meanwhile
+						self._cond.release()
+						try:
+							time.sleep(0)
+						finally:
+							self._cond.acquire()
+				
+				if not self.running:
+					return
+				
+				(due, _, callback, args) = heapq.heappop(self._queue)
+			
+			lateness = time.time() - due
+			self.dispatched += 1
+			self.lateness_total += lateness
+			self.lateness_last = lateness
+			if lateness > self.lateness_max:
+				self.lateness_max = lateness
+			
+			try:
+				if self.lateness_callback != None:
+					self.lateness_callback(lateness, due)
+				
+				callback(*args)
+			except Exception:
+				import traceback
+				sys.stderr.write("%s: exception in scheduled callback %s\n" % (self.__class__.__name__, repr(callback)))
+				traceback.print_exc()
+
+######
+#
+# OSCJitterBuffer class
+#
+######
+
+class OSCJitterBuffer(object):
+	"""Releases the messages of incoming streams at a fixed delay, smoothing out network-jitter.
+	Each message is due at its 'stream-time' (the timetag of the bundle carrying it, or else
+	its arrival-time) plus 'target_delay' seconds. Messages are released in order of due-time
+	by a scheduler-thread, which busy-waits the last 'spin_time' seconds for precise timing.
+	
+	Messages are buffered per stream (any hashable key, e.g. a remote host).
+	A message is dropped as 'late' if it is already overdue on arrival, or if it is due before the last
+	message released from its stream. When releasing a message leaves its stream's buffer empty,
+	an 'underrun' is counted; frequent underruns mean the target-delay is too short for the stream's jitter.
+	
+	Messages given a sequence-number (see OSCClient.setSequencing()) are released in sequence-order instead:
+	such a message is released once it is due *and* no message of its stream with a lower number is still
+	buffered, i.e. at the later of its own due-time and the release of its predecessor. It is 'late' if one
+	with a higher number was released already.
+	"""
+	spin_time = 0.001
+	
+	def __init__(self, target_delay=0.05):
+		"""Instantiate an OSCJitterBuffer, releasing messages 'target_delay' seconds after their stream-time
+		"""
+		self.target_delay = target_delay
+		self.scheduler = OSCScheduler()
+		self.scheduler.spin_time = self.spin_time
+		self._streams = {}		# key -> [queued, last released due-time, released, late, underruns,
+								#		 sequenced heap, (last put sequence-number, unwrapped), last released unwrapped number]
+		self._counter = itertools.count()	# tie-breaker for messages with the same sequence-number
+		self._lock = threading.Lock()
+	
+	def put(self, key, stream_time, callback, *args, sequence=None):
+		"""Buffer a message of the given stream, with the given stream-time (floating seconds since the Epoch).
+		'callback(*args)' is called when the message is released.
+		If a 'sequence' number is given, the message is released in sequence-order (see above).
+		Returns False if the message was dropped as late.
+		"""
+		due = stream_time + self.target_delay
+		with self._lock:
+			stream = self._streams.get(key)
+			if stream == None:
+				stream = [0, 0., 0, 0, 0, [], None, None]
+				self._streams[key] = stream
+			
+			if sequence != None:
+				number = self._unwrap(stream, sequence)
+				if (due < time.time()) or ((stream[7] != None) and (number < stream[7])):
+					stream[3] += 1
+					return False
+				
+				heapq.heappush(stream[5], (number, next(self._counter), due, callback, args))
+				callback = None
+			
+			elif (due < stream[1]) or (due < time.time()):
+				stream[3] += 1
+				return False
+			
+			stream[0] += 1
+		
+		self.scheduler.schedule(due, self._release, key, due, callback, args)
+		return True
+	
+	def _unwrap(self, stream, sequence):
+		"""Returns the given (wrapping) sequence-number as an ever-increasing number, for ordering.
+		Must be called holding the lock"""
+		modulus = OSCSequenceTracker.modulus
+		if stream[6] == None:
+			number = sequence
+		else:
+			(last, last_number) = stream[6]
+			distance = ((sequence - last + modulus // 2) % modulus) - modulus // 2
+			if distance <= -OSCSequenceTracker.restart_distance:
+				# the sender restarted its numbering
+				stream[7] = None
+				number = sequence
+			else:
+				number = last_number + distance
+				if distance < 0:
+					return number
+		
+		stream[6] = (sequence, number)
+		return number
+	
+	def _release(self, key, due, callback, args):
+		"""Called by the scheduler when a buffered message is due.
+		For sequenced messages ('callback' None), releases the stream's lowest-numbered messages,
+		for as long as they are due"""
+		released = []
+		with self._lock:
+			stream = self._streams.get(key)
+			if stream == None:
+				return
+			if callback != None:
+				released.append((callback, args))
+			else:
+				heap = stream[5]
+				while len(heap) and (heap[0][2] <= due):
+					(number, _, _, callback, args) = heapq.heappop(heap)
+					stream[7] = number
+					released.append((callback, args))
+			
+			for item in released:
+				stream[0] -= 1
+				stream[2] += 1
+				if stream[0] == 0:
+					stream[4] += 1
+			if len(released):
+				stream[1] = max(stream[1], due)
+		
+		for (callback, args) in released:
+			callback(*args)
+	
+	def getStats(self):
+		"""Returns a dict {key:stats} where 'stats' is a dict with the number of messages
+		'queued', 'released' & dropped as 'late', and the number of 'underruns' of each stream
+		"""
+		with self._lock:
+			return dict((key, {'queued':stream[0], 'released':stream[2], 'late':stream[3], 'underruns':stream[4]})
+					for (key, stream) in list(self._streams.items()))
+	
+	def resetStats(self):
+		"""Clear the statistics of all streams (messages still queued are kept)
+		"""
+		with self._lock:
+			for stream in list(self._streams.values()):
+				stream[2:5] = [0, 0, 0]
+	
+	def close(self):
+		"""Stop releasing messages. Messages still buffered are discarded.
+		"""
+		self.scheduler.stop()
+		with self._lock:
+			self._streams.clear()
+
+######
+#
+# OSCSendPacer class
+#
+######
+
+class OSCSendPacer(object):
+	"""Paces the packets sent to each destination, so bursts are spread out over time instead of
+	overrunning a receiver's buffers, even when the average rate is fine.
+	Each destination gets a token-bucket limiting it to 'pps' packets and 'bps' bytes per second
+	(either may be None for no limit), holding up to 'burst' seconds' worth of packets.
+	A packet is written straight away if its destination's bucket allows, or else queued and written
+	by a scheduler-thread (see OSCScheduler) when it does, busy-waiting the last 'spin_time' seconds
+	for sub-millisecond spacing. Packets are written by calling 'write(binary, address, timeout)'.
+	Errors (of any kind) raised when writing a queued packet are counted, and kept in 'last_error'.
+	"""
+	spin_time = 0.0005
+	
+	def __init__(self, write, pps=None, bps=None, burst=0.001):
+		"""Instantiate an OSCSendPacer, writing packets through the given 'write' function
+		"""
+		if (pps != None and pps <= 0) or (bps != None and bps <= 0):
+			raise ValueError("'pps' and 'bps' must be positive (or None)")
+		
+		self.write = write
+		self.pps = pps
+		self.bps = bps
+		self.burst = burst
+		self.last_error = None
+		self.scheduler = OSCScheduler()
+		self.scheduler.spin_time = self.spin_time
+		self._dests = {}		# address -> [queue, next send-time, sent, total wait, max wait, errors]
+		self._lock = threading.Lock()
+	
+	def _cost(self, size):
+		"""Returns the time (in seconds) sending a packet of the given size uses up"""
+		cost = 0.
+		if self.pps != None:
+			cost = 1. / self.pps
+		if self.bps != None:
+			cost = max(cost, size / float(self.bps))
+		
+		return cost
+	
+	def put(self, binary, address, timeout=None):
+		"""Write the given binary OSC-packet to the given address now, if its token-bucket allows,
+		or else queue it. Errors raised when writing straight away are passed on.
+		"""
+		now = time.time()
+		with self._lock:
+			dest = self._dests.get(address)
+			if dest == None:
+				dest = [collections.deque(), now, 0, 0., 0., 0]
+				self._dests[address] = dest
+			
+			if len(dest[0]) or (dest[1] - self.burst > now):
+				dest[0].append((now, binary, timeout))
+				if len(dest[0]) == 1:
+					self.scheduler.schedule(dest[1] - self.burst, self._release, address)
+				return
+			
+			dest[1] = max(dest[1], now) + self._cost(len(binary))
+			dest[2] += 1
+			self.write(binary, address, timeout)
+	
+	def _release(self, address):
+		"""Called by the scheduler when the first packet queued for the given address may be written"""
+		with self._lock:
+			dest = self._dests.get(address)
+			if (dest == None) or not len(dest[0]):
+				return
+			
+			(queued, binary, timeout) = dest[0].popleft()
+			now = time.time()
+			dest[1] = max(dest[1], now) + self._cost(len(binary))
+			dest[2] += 1
+			wait = now - queued
+			dest[3] += wait
+			if wait > dest[4]:
+				dest[4] = wait
+			
+			try:
+				self.write(binary, address, timeout)
+			except Exception as e:
+				# the packets queued behind this one still get their turn
+				dest[5] += 1
+				self.last_error = e
+			
+			if len(dest[0]):
+				self.scheduler.schedule(dest[1] - self.burst, self._release, address)
+	
+	def getStats(self):
+		"""Returns a dict {address:stats} where 'stats' is a dict with the number of packets 'queued' & 'sent',
+		the mean & max time (in seconds) sent packets waited in the queue ('wait_mean' & 'wait_max'),
+		and the number of 'errors' writing queued packets
+		"""
+		with self._lock:
+			return dict((address, {'queued':len(dest[0]), 'sent':dest[2], 'wait_mean':dest[3] / max(dest[2], 1),
+						'wait_max':dest[4], 'errors':dest[5]}) for (address, dest) in list(self._dests.items()))
+	
+	def resetStats(self):
+		"""Clear the statistics of all destinations (packets still queued are kept)
+		"""
+		with self._lock:
+			for dest in list(self._dests.values()):
+				dest[2:] = [0, 0., 0., 0]
+	
+	def close(self):
+		"""Stop writing packets. Packets still queued are discarded.
+		"""
+		self.scheduler.stop()
+		with self._lock:
+			self._dests.clear()
+
+######
+#
+# OSCReplyAggregator class
+#
+######
+
+class OSCReplyAggregator(object):
+	"""Collects the replies an OSCServer sends to each remote address.
+	The first reply to an address starts a time-window of 'window' seconds. When the window
+	closes, all replies collected for that address are sent as a single OSCBundle.
+	A bundle is sent early when adding another reply would make it larger than 'mtu' bytes.
+	"""
+	# size of an empty OSC-bundle: '#bundle' string + timetag
+	bundle_header_size = 16
+	
+	def __init__(self, client, window=0.005, mtu=1472):
+		"""Instantiate an OSCReplyAggregator.
+		  - client (OSCClient instance): the Client used to send the aggregated replies.
+		  - window (float): time in seconds replies are held before being sent.
+		  - mtu (int): the maximum size in bytes of the bundles sent.
+		"""
+		self.client = client
+		self.window = window
+		self.mtu = mtu
+		self._pending = {}		# address -> [size, [replies]], the batch being collected
+		self._lock = threading.Lock()
+		self._scheduler = OSCScheduler()
+		self.replies_sent = 0
+		self.packets_sent = 0
+	
+	def add(self, msg, address):
+		"""Queue an OSCMessage (or OSCBundle) for sending to the given (host, port) address
+		"""
+		binary = msg.getBinary()
+		size = len(binary) + 4
+		full = None
+		with self._lock:
+			entry = self._pending.get(address)
+			if (entry != None) and ((entry[0] + size) > self.mtu):
+				full = entry[1]
+				entry = None
+			
+			if entry == None:
+				# a new batch, with its own window
+				entry = self._pending[address] = [self.bundle_header_size, []]
+				self._scheduler.schedule(time.time() + self.window, self._flushScheduled, address, entry)
+				
+			entry[0] += size
+			entry[1].append((msg, binary))
+		
+		if full:
+			self._send(full, address)
+	
+	def flush(self, address=None):
+		"""Send all replies queued for the given address, or for all addresses if 'address' is None
+		"""
+		with self._lock:
+			if address == None:
+				pending = self._pending
+				self._pending = {}
+			elif address in self._pending:
+				pending = {address:self._pending.pop(address)}
+			else:
+				return
+		
+		for (addr, (_, replies)) in list(pending.items()):
+			self._send(replies, addr)
+	
+	def close(self):
+		"""Send any queued replies, and stop the aggregator's scheduler
+		"""
+		self._scheduler.stop()
+		self.flush()
+	
+	def _flushScheduled(self, address, entry):
+		"""Called by the scheduler when the window of the given batch closes.
+		Does nothing if that batch was sent already (when full, or by flush())"""
+		with self._lock:
+			if self._pending.get(address) is not entry:
+				return
+			del self._pending[address]
+		
+		self._send(entry[1], address)
+	
+	def _send(self, replies, address):
+		"""Send the given list of (reply, binary) tuples, as a bundle if there is more than one"""
+		if len(replies) > 1:
+			# the replies are encoded already, so build the bundle from their binaries
+			msg = OSCBundle()
+			msg.message = b"".join([struct.pack(">i", len(binary)) + binary for (_, binary) in replies])
+			msg.typetags += "b" * len(replies)
+		else:
+			msg = replies[0][0]
+		
+		self.client.sendto(msg, address)
+		self.replies_sent += len(replies)
+		self.packets_sent += 1
+
+class OSCBundlingClient(object):
+	"""Wraps an OSCClient, packing the messages sent through it into OSCBundles.
+	Messages sent to the same address are queued, and sent as a single bundle of at most 'mtu' bytes
+	when the bundle is full, when the oldest queued message has waited 'max_latency' seconds,
+	or when flush() is called. This cuts the number of packets sent for lots of small messages,
+	while keeping each message's latency bounded.
+	"""
+	def __init__(self, client=None, max_latency=0.005, mtu=1472):
+		"""Instantiate an OSCBundlingClient.
+		  - client (OSCClient instance): the Client used to send the bundles.
+		  If none is supplied (default) an OSCClient will be created.
+		  - max_latency (float): the longest time in seconds a message is queued.
+		  - mtu (int): the maximum size in bytes of the bundles sent.
+		"""
+		if client == None:
+			client = OSCClient()
+		
+		self.client = client
+		self.aggregator = OSCReplyAggregator(client, max_latency, mtu)
+	
+	def connect(self, address):
+		"""Connect the wrapped Client to the given (host, port) address (see OSCClient.connect())
+		"""
+		self.client.connect(address)
+	
+	def send(self, msg, timeout=None):
+		"""Queue the given OSCMessage (or OSCBundle) for sending to the address the wrapped Client is connected to.
+		Queued messages are sent later, so the 'timeout' is ignored.
+		"""
+		if self.client.client_address == None:
+			raise OSCClientError("Called send() on non-connected client")
+		
+		self.aggregator.add(msg, self.client.client_address)
+	
+	def sendto(self, msg, address, timeout=None):
+		"""Queue the given OSCMessage (or OSCBundle) for sending to the given (host, port) address.
+		Queued messages are sent later, so the 'timeout' is ignored.
+		"""
+		self.aggregator.add(msg, address)
+	
+	def flush(self, address=None):
+		"""Send the messages queued for the given address, or for all addresses if 'address' is None
+		"""
+		self.aggregator.flush(address)
+	
+	def getStats(self):
+		"""Returns a dict with the number of 'messages' & 'packets' sent so far
+		"""
+		return {'messages':self.aggregator.replies_sent, 'packets':self.aggregator.packets_sent}
+	
+	def close(self):
+		"""Send any queued messages, and close the wrapped Client
+		"""
+		self.aggregator.close()
+		self.client.close()
+
+######
+#
+# OSCServer traffic-control classes
+#
+######
+
+def _countPerKey(counts, key, max_keys):
+	"""Add one to counts[key], in an OrderedDict holding at most 'max_keys' keys (plus 'other').
+	When a new key doesn't fit, the count of the least-recently counted key is merged into that of key 'other',
+	so a flood of ever-changing (e.g. spoofed) keys can't grow the dict without bound.
+	"""
+	count = counts.get(key)
+	if count != None:
+		counts[key] = count + 1
+		counts.move_to_end(key)
+		return
+	
+	if (len(counts) - ('other' in counts)) >= max_keys:
+		other = counts.pop('other', 0)
+		if len(counts):
+			other += counts.popitem(last=False)[1]
+		counts['other'] = other
+	
+	counts[key] = 1
+
+class OSCSourceLimiter(object):
+	"""Per-source token-bucket rate-limiter.
+	Each source (i.e. remote host) gets a bucket holding up to 'burst' tokens, which refills
+	at 'rate' tokens per second. Each packet takes one token; packets arriving at an empty
+	bucket are dropped, and counted in the 'drops' dict {source:count}.
+	"""
+	# when tracking more sources than this, buckets that have refilled completely are forgotten
+	max_sources = 4096
+	# drops are counted for at most this many sources; those of the least-recently dropping are merged into 'other'
+	max_drop_sources = 1024
+	
+	def __init__(self, rate, burst=None):
+		"""Instantiate an OSCSourceLimiter.
+		  - rate (float): packets per second allowed for each source.
+		  - burst (int): the number of packets a source may send in one go. Defaults to 'rate'.
+		"""
+		self.rate = float(rate)
+		if burst == None:
+			burst = rate
+		self.burst = max(float(burst), 1.)
+		self._buckets = {}		# source -> [tokens, time of last update]
+		self.drops = collections.OrderedDict()	# source -> count, least-recently dropping first
+	
+	def allow(self, source):
+		"""Take a token from the given source's bucket.
+		Returns True if the packet may pass, False if it is to be dropped.
+		"""
+		now = time.time()
+		bucket = self._buckets.get(source)
+		if bucket == None:
+			if len(self._buckets) >= self.max_sources:
+				self._prune(now)
+			bucket = self._buckets[source] = [self.burst, now]
+		else:
+			bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+			bucket[1] = now
+		
+		if bucket[0] >= 1.:
+			bucket[0] -= 1.
+			return True
+		
+		_countPerKey(self.drops, source, self.max_drop_sources)
+		return False
+	
+	def _prune(self, now):
+		"""Forget the buckets that have refilled completely"""
+		for (source, (tokens, last)) in list(self._buckets.items()):
+			if (tokens + (now - last) * self.rate) >= self.burst:
+				del self._buckets[source]
+
+class OSCFairQueue(object):
+	"""Round-robin ('fair') queue.
+	Items are queued per source, and taken from each source in turn, so a source
+	sending lots of packets can't delay the packets of other sources for long.
+	Each source's queue holds at most 'maxlen' items; items put in a full queue are dropped,
+	and counted in the 'drops' dict {source:count}.
+	"""
+	# drops are counted for at most this many sources; those of the least-recently dropping are merged into 'other'
+	max_drop_sources = 1024
+	
+	def __init__(self, maxlen=64):
+		"""Instantiate an OSCFairQueue, queueing up to 'maxlen' items per source.
+		"""
+		self.maxlen = maxlen
+		self._queues = {}					# source -> deque of items
+		self._active = collections.deque()	# sources with items queued, in round-robin order
+		self._cond = threading.Condition()
+		self._closed = False
+		self.drops = collections.OrderedDict()	# source -> count, least-recently dropping first
+	
+	def __len__(self):
+		"""Returns the number of queued items
+		"""
+		with self._cond:
+			return sum([len(q) for q in list(self._queues.values())])
+	
+	def put(self, source, item):
+		"""Queue an item for the given source.
+		Returns False if the item was dropped because the source's queue is full.
+		"""
+		with self._cond:
+			queue = self._queues.get(source)
+			if queue == None:
+				queue = self._queues[source] = collections.deque()
+				self._active.append(source)
+			elif len(queue) >= self.maxlen:
+				_countPerKey(self.drops, source, self.max_drop_sources)
+				return False
+			
+			queue.append(item)
+			self._cond.notify()
+			return True
+	
+	def get(self, timeout=None):
+		"""Returns the next (source, item) tuple, taking items from each source in turn.
+		Blocks until an item is available, or until 'timeout' seconds have passed.
+		Returns None on timeout, or when the queue has been closed.
+		"""
+		with self._cond:
+			if not self._cond.wait_for(lambda: len(self._active) or self._closed, timeout):
+				return None
+			
+			if self._closed:
+				return None
+			
+			source = self._active.popleft()
+			queue = self._queues[source]
+			item = queue.popleft()
+			if len(queue):
+				self._active.append(source)
+			else:
+				del self._queues[source]
+			
+			return (source, item)
+	
+	def close(self):
+		"""Discard all queued items and wake up any waiting get() calls
+		"""
+		with self._cond:
+			self._closed = True
+			self._queues = {}
+			self._active.clear()
+			self._cond.notify_all()
+
+class OSCPacketRing(object):
+	"""Preallocated ring-buffer of raw (undecoded) datagrams.
+	A single receiving thread reads datagrams straight from the socket into the ring's slots
+	(see receive()), together with their source-address and arrival time. One or more
+	consumer threads take the packets out of the ring (see get()) to decode & dispatch them.
+	This way, a consumer stalling for a short while doesn't stop the socket from being read,
+	and packets don't get dropped by the kernel.
+	When all slots are full, newly received packets are dropped and counted as 'overruns'.
+	"""
+	def __init__(self, slots=1024, slot_size=8192):
+		"""Instantiate an OSCPacketRing.
+		  - slots (int): the number of packets the ring can hold.
+		  - slot_size (int): the maximum size of a packet. Larger packets are truncated.
+		"""
+		self.slots = slots
+		self.slot_size = slot_size
+		self._buffers = [bytearray(slot_size) for i in range(slots)]
+		self._views = [memoryview(buf) for buf in self._buffers]
+		self._sizes = [0] * slots
+		self._addresses = [None] * slots
+		self._timestamps = [0] * slots
+		self._scratch = bytearray(slot_size)	# receives the packets dropped on overrun
+		self._head = 0		# total number of packets written
+		self._tail = 0		# total number of packets taken
+		self._cond = threading.Condition()
+		self._closed = False
+		self.received = 0
+		self.overruns = 0
+		self.high_water = 0
+		
+		# if True, the arrival time is taken from the kernel's SO_TIMESTAMPNS ancillary data
+		self.kernel_timestamps = False
+	
+	def __len__(self):
+		"""Returns the number of packets currently in the ring
+		"""
+		return self._head - self._tail
+	
+	def receive(self, skt):
+		"""Receive one datagram from the given socket into the next free slot.
+		This must only be called from a single (receiving) thread.
+		Returns False if the ring was full and the packet was dropped.
+		Socket errors (including timeouts) are passed on to the caller.
+		"""
+		if (self._head - self._tail) >= self.slots:
+			skt.recvfrom_into(self._scratch)
+			self.overruns += 1
+			return False
+		
+		i = self._head % self.slots
+		timestamp = None
+		if self.kernel_timestamps:
+			(size, ancdata, _, address) = skt.recvmsg_into([self._views[i]], _timespec_cmsg_size)
+			timestamp = _kernelTimestamp(ancdata)
+		else:
+			(size, address) = skt.recvfrom_into(self._views[i])
+		
+		if timestamp == None:
+			timestamp = time.time_ns()
+		
+		self._sizes[i] = size
+		self._addresses[i] = address
+		self._timestamps[i] = timestamp
+		
+		with self._cond:
+			self._head += 1
+			self.received += 1
+			occupancy = self._head - self._tail
+			if occupancy > self.high_water:
+				self.high_water = occupancy
+			self._cond.notify()
+		
+		return True
+	
+	def get(self, timeout=None):
+		"""Take the oldest packet out of the ring, as a (data, address, timestamp) tuple,
+		where timestamp is the packet's arrival time in integer nanoseconds since the Epoch.
+		Blocks until a packet is available, or until 'timeout' seconds have passed.
+		Returns None on timeout, or when the ring has been closed.
+		"""
+		with self._cond:
+			if not self._cond.wait_for(lambda: (self._head > self._tail) or self._closed, timeout):
+				return None
+			
+			if self._closed:
+				return None
+			
+			i = self._tail % self.slots
+			packet = (bytes(self._views[i][:self._sizes[i]]), self._addresses[i], self._timestamps[i])
+			self._tail += 1
+			return packet
+	
+	def getStats(self):
+		"""Returns a dict with the ring's current occupancy & size, its highest occupancy so far,
+		and the number of packets received & dropped because the ring was full
+		"""
+		return {'occupancy':len(self), 'slots':self.slots, 'high_water':self.high_water,
+			'received':self.received, 'overruns':self.overruns}
+	
+	def close(self):
+		"""Wake up any waiting get() calls, which then return None
+		"""
+		with self._cond:
+			self._closed = True
+			self._cond.notify_all()
+
+class OSCClockEstimator(object):
+	"""Estimates the offset & drift of each remote host's clock, relative to the local clock.
+	
+	Each sample pairs a remote clock-reading (the send-time, as stamped by the remote host)
+	with the local arrival-time of the packet carrying it. Their difference is the clock-offset
+	plus the network-delay, which varies but is never negative. So the estimate follows the lower
+	envelope of the last 'window' samples: these are split into 'envelope_segments' consecutive runs,
+	the drift is fitted by least-squares through the minimum-delay sample of each run, and the offset
+	is the smallest of the drift-corrected differences. Until a source has 'min_drift_samples' samples,
+	spanning at least 'min_drift_span' seconds, its drift is taken to be 0 (a fit through only a few,
+	closely spaced samples mostly measures delay-jitter).
+	Estimates are kept per source (remote host), in integer nanoseconds.
+	"""
+	# the fitted drift is clipped to +/- this many seconds per second
+	max_drift = 0.0005
+	
+	# the number of samples, and the time they span (in seconds), needed before drift is estimated
+	min_drift_samples = 8
+	min_drift_span = 10.
+	
+	# the number of runs of samples the lower envelope is taken from
+	envelope_segments = 4
+	
+	def __init__(self, window=32):
+		"""Instantiate an OSCClockEstimator, fitting the last 'window' samples of each source
+		"""
+		self.window = max(int(window), 1)
+		self._samples = {}		# source -> deque of (local_ns, local_ns - remote_ns)
+		self._fits = {}			# source -> (local_ns, offset_ns, drift)
+		self._lock = threading.Lock()
+	
+	def addSample(self, source, remote_ns, local_ns=None):
+		"""Add a clock-sample for the given source: a remote clock-reading and the local time
+		it was received at (default: now), both in integer nanoseconds since the Epoch.
+		"""
+		if local_ns == None:
+			local_ns = time.time_ns()
+		
+		with self._lock:
+			samples = self._samples.get(source)
+			if samples == None:
+				samples = collections.deque(maxlen=self.window)
+				self._samples[source] = samples
+			
+			samples.append((local_ns, local_ns - remote_ns))
+			self._fits[source] = self._fit(samples)
+	
+	def _fit(self, samples):
+		"""Fit the lower envelope of the given samples, relative to the most recent one"""
+		(t0, o0) = samples[-1]
+		n = len(samples)
+		drift = 0.
+		segments = min(self.envelope_segments, n)
+		if (n >= self.min_drift_samples) and (segments >= 2) and (t0 - samples[0][0] >= self.min_drift_span * 1e9):
+			# the minimum-delay (i.e. minimum-offset) sample of each run of samples
+			ordered = list(samples)
+			lows = [min(ordered[(i * n) // segments:((i + 1) * n) // segments], key=lambda sample: sample[1])
+					for i in range(segments)]
+			xs = [t - t0 for (t, o) in lows]
+			ys = [o - o0 for (t, o) in lows]
+			mx = sum(xs) / segments
+			my = sum(ys) / segments
+			sxx = sum((x - mx) ** 2 for x in xs)
+			if sxx > 0:
+				drift = sum((x - mx) * (y - my) for (x, y) in zip(xs, ys)) / sxx
+				drift = max(-self.max_drift, min(drift, self.max_drift))
+		
+		base = min((o - o0) - drift * (t - t0) for (t, o) in samples)
+		return (t0, o0 + int(base), drift)
+	
+	def offset(self, source, local_ns=None):
+		"""Returns the estimated offset (local clock - remote clock) of the given source
+		at the given local time (default: now), in integer nanoseconds.
+		Returns 0 if there are no samples for the source.
+		"""
+		fit = self._fits.get(source)
+		if fit == None:
+			return 0
+		
+		if local_ns == None:
+			local_ns = time.time_ns()
+		
+		(t0, o0, drift) = fit
+		return o0 + int(drift * (local_ns - t0))
+	
+	def toLocal(self, source, remote_ns):
+		"""Convert a remote clock-reading of the given source to local time (integer nanoseconds since the Epoch)
+		"""
+		fit = self._fits.get(source)
+		if fit == None:
+			return remote_ns
+		
+		return remote_ns + self.offset(source, remote_ns + fit[1])
+	
+	def getEstimates(self):
+		"""Returns a dict {source:(offset_ns, drift)} with the current estimates for all sources
+		"""
+		now = time.time_ns()
+		return dict((source, (self.offset(source, now), fit[2])) for (source, fit) in list(self._fits.items()))
+	
+	def forget(self, source=None):
+		"""Discard the samples of the given source, or of all sources
+		"""
+		with self._lock:
+			if source == None:
+				self._samples.clear()
+				self._fits.clear()
+			else:
+				self._samples.pop(source, None)
+				self._fits.pop(source, None)
+
+class OSCSequenceTracker(object):
+	"""Tracks the sequence-numbers of incoming packets per source, counting lost, duplicate & reordered packets.
+	
+	Senders opt in by numbering their packets (see OSCClient.setSequencing()), either by wrapping each packet
+	in a bundle whose first message is '/_seq <int>' ('bundle' mode), or by appending the number to each
+	message as a trailing int argument ('argument' mode). Sequence-numbers count up from 0, modulo 'modulus'.
+	
+	The state per source is constant: the highest sequence-number seen, and a 64-bit mask of which
+	of the preceding 64 packets have arrived. A gap counts as lost until the missing packets arrive out of order,
+	which makes them 'reordered' instead. Packets older than the mask are counted as 'stale', and a jump far
+	backwards (e.g. a restarted sender) resets the source's state, counting a 'restart'.
+	"""
+	address = "/_seq"
+	modulus = 0x80000000
+	window = 64
+	restart_distance = 0x10000
+	
+	def __init__(self, mode='bundle'):
+		"""Instantiate an OSCSequenceTracker.
+		  - mode ('bundle' | 'argument'): where senders put the sequence-numbers.
+		  Bundle-wrappers are recognized in either mode.
+		"""
+		if mode not in ('bundle', 'argument'):
+			raise ValueError("invalid sequencing mode %s" % repr(mode))
+		
+		self.mode = mode
+		self._sources = {}		# source -> [highest, mask, received, lost, duplicates, reordered, stale, restarts]
+		self._lock = threading.Lock()
+	
+	def strip(self, decoded, source):
+		"""Take the sequence-number from the given decoded packet, record it for the given source,
+		and return the packet without it. Packets without a sequence-number are returned as-is.
+		"""
+		return self.split(decoded, source)[0]
+	
+	def split(self, decoded, source):
+		"""Like strip(), but returns a (packet, sequence-number) tuple.
+		The sequence-number is None for packets without one.
+		"""
+		if not len(decoded):
+			return (decoded, None)
+		
+		if decoded[0] == "#bundle":
+			# an element decoded from an address-only message is empty
+			if (len(decoded) > 2) and (len(decoded[2]) >= 3) and (decoded[2][0] == self.address) and (decoded[2][1] == ",i"):
+				seq = decoded[2][2]
+				self.record(source, seq)
+				if (not decoded[1]) and (len(decoded) == 4):
+					return (decoded[3], seq)
+				return (decoded[:2] + decoded[3:], seq)
+		
+		elif (self.mode == 'argument') and (len(decoded) >= 2) and decoded[1].endswith('i'):
+			self.record(source, decoded[-1])
+			return ([decoded[0], decoded[1][:-1]] + decoded[2:-1], decoded[-1])
+		
+		return (decoded, None)
+	
+	def record(self, source, seq):
+		"""Record the arrival of the given sequence-number from the given source
+		"""
+		with self._lock:
+			state = self._sources.get(source)
+			if state == None:
+				self._sources[source] = [seq, 1, 1, 0, 0, 0, 0, 0]
+				return
+			
+			state[2] += 1
+			distance = ((seq - state[0] + self.modulus // 2) % self.modulus) - self.modulus // 2
+			if distance > 0:
+				state[3] += distance - 1
+				state[1] = ((state[1] << distance) | 1) & 0xffffffffffffffff
+				state[0] = seq
+			elif distance == 0:
+				state[4] += 1
+			elif distance <= -self.restart_distance:
+				self._sources[source] = [seq, 1, 1, 0, 0, 0, 0, state[7] + 1]
+			elif distance <= -self.window:
+				state[6] += 1
+			elif state[1] & (1 << -distance):
+				state[4] += 1
+			else:
+				state[1] |= (1 << -distance)
+				state[3] -= 1
+				state[5] += 1
+	
+	def getStats(self):
+		"""Returns a dict {source:stats}, where 'stats' is a dict with the number of packets
+		'received', 'lost', 'duplicates', 'reordered' & 'stale', and the number of 'restarts' of each source
+		"""
+		with self._lock:
+			return dict((source, {'received':state[2], 'lost':state[3], 'duplicates':state[4],
+					'reordered':state[5], 'stale':state[6], 'restarts':state[7]})
+					for (source, state) in list(self._sources.items()))
+	
+	def reset(self, source=None):
+		"""Forget the state of the given source, or of all sources
+		"""
+		with self._lock:
+			if source == None:
+				self._sources.clear()
+			else:
+				self._sources.pop(source, None)
+
+######
+#
+# OSCSchema class
+#
+######
+
+class OSCSchema(object):
+	"""A typed address-schema: OSCMessages sent to OSC-addresses matching 'pattern'
+	(which may contain '*', '?' & such) must carry exactly the given 'typetags'.
+	The typetags are kept as they appear in a binary OSC-message, so a message's header can be checked
+	with a single compare. Schemas consisting of only 'i', 'f' & 'd' typetags also get a precompiled
+	struct, which decodes a message's arguments in one go.
+	"""
+	# struct-formats of the typetags a precompiled struct can decode
+	struct_formats = {'i':'i', 'f':'f', 'd':'d'}
+	
+	def __init__(self, pattern, typetags):
+		"""Instantiate an OSCSchema for the given address-pattern and typetags (with or without leading ',')
+		"""
+		self.pattern = pattern
+		self.typetags = typetags.lstrip(',')
+		self.regex = getRegEx(pattern)
+		self.header = OSCString("," + self.typetags)
 		
-		if type(callback) not in (types.FunctionType, types.MethodType):
-			raise OSCServerError("Message callback '%s' is not callable" % repr(callback))
+		if all(tag in self.struct_formats for tag in self.typetags):
+			self.struct = struct.Struct(">" + "".join(self.struct_formats[tag] for tag in self.typetags))
+		else:
+			self.struct = None
+	
+	def matches(self, address):
+		"""Returns True if this schema applies to the given OSC-address
+		"""
+		return self.regex.fullmatch(address) != None
+	
+	def decode(self, packet, address, offset):
+		"""Decode the binary OSC-message 'packet', whose typetags start at 'offset'.
+		Returns the decoded message (like decodeOSC()), [] if the message does not match
+		the schema, or None if the schema has no precompiled struct.
+		"""
+		if packet[offset:offset + len(self.header)] != self.header:
+			return []
 		
-		if address != 'default':
-			address = '/' + address.strip('/')
-			
-		self.callbacks[address] = callback
+		if self.struct == None:
+			return None
 		
-	def delMsgHandler(self, address):
-		"""Remove the registered handler for the given OSC-address
+		offset += len(self.header)
+		if (len(packet) - offset) != self.struct.size:
+			return []
+		
+		return [address, "," + self.typetags] + list(self.struct.unpack_from(packet, offset))
+
+######
+#
+# Real-time tuning
+#
+######
+
+def setThreadRealtime(affinity=None, fifo_priority=None, nice=None):
+	"""Tune the calling thread for low-latency work. Each knob is optional:
+	  - affinity (list of ints): the CPUs the thread may run on (os.sched_setaffinity()).
+	  - fifo_priority (int): run under the SCHED_FIFO real-time scheduling-policy, with this priority (1-99).
+	  This usually requires root, or CAP_SYS_NICE. Beware that a SCHED_FIFO thread that never sleeps
+	  can lock up its CPU.
+	  - nice (int): the thread's niceness. Negative values usually require privileges.
+	These knobs are only available on Linux (where they apply to the calling thread only).
+	Returns a dict {knob:result}, where result is True if the knob was applied,
+	or a string saying why it wasn't (e.g. not permitted).
+	"""
+	out = {}
+	if affinity != None:
+		if hasattr(os, 'sched_setaffinity'):
+			try:
+				os.sched_setaffinity(0, affinity)
+				out['affinity'] = True
+			except (OSError, ValueError) as e:
+				out['affinity'] = str(e)
+		else:
+			out['affinity'] = "not supported on %s" % sys.platform
+	
+	if fifo_priority != None:
+		if hasattr(os, 'sched_setscheduler'):
+			try:
+				os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(fifo_priority))
+				out['fifo_priority'] = True
+			except (OSError, ValueError) as e:
+				out['fifo_priority'] = str(e)
+		else:
+			out['fifo_priority'] = "not supported on %s" % sys.platform
+	
+	if nice != None:
+		if sys.platform.startswith('linux'):
+			try:
+				os.setpriority(os.PRIO_PROCESS, 0, nice)
+				out['nice'] = True
+			except OSError as e:
+				out['nice'] = str(e)
+		else:
+			out['nice'] = "not supported on %s" % sys.platform
+	
+	return out
+
+def freezeGC():
+	"""Collect all garbage, then move all surviving objects into the garbage-collector's permanent generation
+	(gc.freeze()), so later collections don't have to traverse them.
+	Call this after warming up (once all long-lived objects exist). Returns the number of frozen objects.
+	"""
+	gc.collect()
+	gc.freeze()
+	return gc.get_freeze_count()
+
+class OSCGCMonitor(object):
+	"""Measures the pauses caused by the garbage-collector, using gc.callbacks.
+	If 'report_threshold' is given, pauses longer than that many seconds are reported
+	by calling 'report(pause, generation)', or by printing to stderr if 'report' is None.
+	"""
+	def __init__(self, report_threshold=None, report=None):
+		"""Instantiate an OSCGCMonitor. Call start() to start monitoring.
 		"""
-		del self.callbacks[address]
+		self.report_threshold = report_threshold
+		self.report = report
+		self._start = None
+		self.resetStats()
 	
-	def getOSCAddressSpace(self):
-		"""Returns a list containing all OSC-addresses registerd with this Server. 
+	def start(self):
+		"""Start measuring garbage-collection pauses
 		"""
-		return list(self.callbacks.keys())
+		if self._callback not in gc.callbacks:
+			gc.callbacks.append(self._callback)
 	
-	def dispatchMessage(self, pattern, tags, data, client_address):
-		"""Attmept to match the given OSC-address pattern, which may contain '*',
-		against all callbacks registered with the OSCServer.
-		Calls the matching callback and returns whatever it returns.
-		If no match is found, and a 'default' callback is registered, it calls that one,
-		or raises NoCallbackError if a 'default' callback is not registered.
-		
-		  - pattern (string):  The OSC-address of the receied message
-		  - tags (string):  The OSC-typetags of the receied message's arguments, without ','
-		  - data (list):  The message arguments
+	def stop(self):
+		"""Stop measuring garbage-collection pauses
 		"""
-		if len(tags) != len(data):
-			raise OSCServerError("Malformed OSC-message; got %d typetags [%s] vs. %d values" % (len(tags), tags, len(data)))
+		if self._callback in gc.callbacks:
+			gc.callbacks.remove(self._callback)
+	
+	def resetStats(self):
+		"""Clear the recorded pauses
+		"""
+		self.collections = [0, 0, 0]
+		self.pause_total = 0.
+		self.pause_max = 0.
+		self.pause_last = 0.
+	
+	def getStats(self):
+		"""Returns a dict with the number of 'collections' (per generation),
+		and the 'total', 'max' & 'last' pause (in seconds)
+		"""
+		return {'collections':list(self.collections), 'total':self.pause_total, 'max':self.pause_max, 'last':self.pause_last}
+	
+	def _callback(self, phase, info):
+		"""Called by the garbage-collector before & after each collection"""
+		if phase == 'start':
+			self._start = time.perf_counter()
+			return
 		
-		expr = getRegEx(pattern)
+		if self._start == None:
+			return
 		
-		replies = []
-		matched = 0
-		for addr in list(self.callbacks.keys()):
-			match = expr.match(addr)
-			if match and (match.end() == len(addr)):
-				reply = self.callbacks[addr](pattern, tags, data, client_address)
-				matched += 1
-				if isinstance(reply, OSCMessage):
-					replies.append(reply)
-				elif reply != None:
-					raise TypeError("Message-callback %s did not return OSCMessage or None: %s" % (self.server.callbacks[addr], type(reply)))
-					
-		if matched == 0:
-			if 'default' in self.callbacks:
-				reply = self.callbacks['default'](pattern, tags, data, client_address)
-				if isinstance(reply, OSCMessage):
-					replies.append(reply)
-				elif reply != None:
-					raise TypeError("Message-callback %s did not return OSCMessage or None: %s" % (self.server.callbacks['default'], type(reply)))
+		pause = time.perf_counter() - self._start
+		self._start = None
+		generation = info.get('generation', 0)
+		self.collections[generation] += 1
+		self.pause_total += pause
+		self.pause_last = pause
+		if pause > self.pause_max:
+			self.pause_max = pause
+		
+		if (self.report_threshold != None) and (pause > self.report_threshold):
+			if self.report != None:
+				self.report(pause, generation)
 			else:
-				raise NoCallbackError(pattern)
-		
-		return replies
+				sys.stderr.write("%s: generation %d garbage-collection paused for %.3f ms\n" % (self.__class__.__name__, generation, pause * 1e3))
 
 ######
 #
@@ -1765,32 +3727,93 @@ class OSCAddressSpace:
 class OSCRequestHandler(DatagramRequestHandler):
 	"""RequestHandler class for the OSCServer
 	"""
+	# the sequence-number of the packet being handled, if any (see OSCServer.setSequenceTracking())
+	sequence = None
+	
 	def setup(self):
 		"""Prepare RequestHandler.
-		Unpacks request as (packet, source socket address)
+		Unpacks request as (packet, socket, arrival-timestamp)
 		Creates an empty list for replies.
 		"""
-		(self.packet, self.socket) = self.request
+		(self.packet, self.socket, self.timestamp) = self.request
 		self.replies = []
 
 	def _unbundle(self, decoded):
-		"""Recursive bundle-unpacking function"""
+		"""Recursive bundle-unpacking function.
+		Bundles with a timetag in the future are handed to the server's scheduler,
+		which dispatches them when they are due.
+		If the server has a jitter-buffer, all messages are handed to that instead.
+		"""
+		if self.server.jitter_buffer != None:
+			self._bufferMessages(decoded, self.timestamp / 1e9)
+			return
+		
 		if decoded[0] != "#bundle":
-			self.replies += self.server.dispatchMessage(decoded[0], decoded[1][1:], decoded[2:], self.client_address)
+			self.replies += self.server.dispatchMessage(decoded[0], decoded[1][1:], decoded[2:], self.client_address, self.timestamp)
 			return
 		
-		now = time.time()
-		timetag = decoded[1]
-		if (timetag > 0.) and (timetag > now):
-			time.sleep(timetag - now)
+		due = self.server.bundleDueTime(decoded[1], self.client_address)
+		if due > time.time():
+			self.server.scheduler.schedule(due, self._dispatchScheduled, decoded)
+			return
+		
+		self._dispatchBundleContents(decoded)
 		
+	def _dispatchBundleContents(self, decoded):
+		"""Unbundle & dispatch the contents of the given (due) bundle"""
 		for msg in decoded[2:]:
 			self._unbundle(msg)
 		
+	def _dispatchScheduled(self, decoded):
+		"""Called by the server's scheduler when a held bundle is due.
+		Works on a (shallow) copy of this RequestHandler, so the replies gathered here
+		don't get mixed up with those of the original request, or of other held bundles.
+		"""
+		handler = copy.copy(self)
+		handler.replies = []
+		try:
+			handler._dispatchBundleContents(decoded)
+			handler.finish()
+		except Exception:
+			self.server.handle_error(self.request, self.client_address)
+		
+	def _bufferMessages(self, decoded, stream_time):
+		"""Recursively hand the messages contained in the given packet to the server's jitter-buffer.
+		Each message's stream-time is the timetag of the innermost bundle carrying it,
+		or the packet's arrival-time.
+		"""
+		if decoded[0] != "#bundle":
+			if self.server.jitter_per_address:
+				key = (self.client_address[0], decoded[0])
+			else:
+				key = self.client_address[0]
+			
+			self.server.jitter_buffer.put(key, stream_time, self._dispatchBuffered, decoded, sequence=self.sequence)
+			return
+		
+		due = self.server.bundleDueTime(decoded[1], self.client_address)
+		if due:
+			stream_time = due
+		
+		for msg in decoded[2:]:
+			self._bufferMessages(msg, stream_time)
+		
+	def _dispatchBuffered(self, decoded):
+		"""Called by the server's jitter-buffer when a buffered message is released.
+		Like _dispatchScheduled(), this works on a (shallow) copy of this RequestHandler.
+		"""
+		handler = copy.copy(self)
+		handler.replies = []
+		try:
+			handler.replies += self.server.dispatchMessage(decoded[0], decoded[1][1:], decoded[2:], self.client_address, self.timestamp)
+			handler.finish()
+		except Exception:
+			self.server.handle_error(self.request, self.client_address)
+		
 	def handle(self):
 		"""Handle incoming OSCMessage
 		"""
-		decoded = decodeOSC(self.packet)
+		(decoded, self.sequence) = self.server._decodeSequenced(self.packet, self.client_address)
 		if not len(decoded):
 			return
 		
@@ -1804,6 +3827,11 @@ class OSCRequestHandler(DatagramRequestHandler):
 		if self.server.return_port:
 			self.client_address = (self.client_address[0], self.server.return_port)
 		
+		if self.server.reply_aggregator != None:
+			for reply in self.replies:
+				self.server.reply_aggregator.add(reply, self.client_address)
+			return
+		
 		if len(self.replies) > 1:
 			msg = OSCBundle()
 			for reply in self.replies:
@@ -1817,39 +3845,56 @@ class OSCRequestHandler(DatagramRequestHandler):
 
 class ThreadingOSCRequestHandler(OSCRequestHandler):
 	"""Multi-threaded OSCRequestHandler;
-	Starts a new RequestHandler thread for each unbundled OSCMessage
+	Hands each unbundled OSCMessage to the server's pool of worker-threads
 	"""
-	def _unbundle(self, decoded):
-		"""Recursive bundle-unpacking function
-		This version starts a new thread for each sub-Bundle found in the Bundle,
-		then waits for all its children to finish.
+	def _flattenBundle(self, decoded, msgs):
+		"""Recursively collect the (due) OSCMessages contained in the given bundle into 'msgs'.
+		Sub-bundles with a timetag in the future are handed to the server's scheduler.
 		"""
-		if decoded[0] != "#bundle":
-			self.replies += self.server.dispatchMessage(decoded[0], decoded[1][1:], decoded[2:], self.client_address)
+		for msg in decoded[2:]:
+			if msg[0] != "#bundle":
+				msgs.append(msg)
+				continue
+			
+			due = self.server.bundleDueTime(msg[1], self.client_address)
+			if due > time.time():
+				self.server.scheduler.schedule(due, self._dispatchScheduled, msg)
+			else:
+				self._flattenBundle(msg, msgs)
+		
+	def _dispatchBundleContents(self, decoded):
+		"""Unbundle & dispatch the contents of the given (due) bundle.
+		The bundle's messages are dispatched concurrently by the server's worker-pool,
+		or one-by-one, in order of appearance, if the server's 'ordered_bundles' is set.
+		This waits for all messages to be handled. Replies are kept in order of appearance.
+		"""
+		msgs = []
+		self._flattenBundle(decoded, msgs)
+		
+		if self.server.ordered_bundles or (len(msgs) < 2):
+			for msg in msgs:
+				self.replies += self.server.dispatchMessage(msg[0], msg[1][1:], msg[2:], self.client_address, self.timestamp)
 			return
 		
-		now = time.time()
-		timetag = decoded[1]
-		if (timetag > 0.) and (timetag > now):
-			time.sleep(timetag - now)
-			now = time.time()
-			
-		children = []
+		futures = []
+		for msg in msgs:
+			futures.append(self.server.pool.submit(self.server.dispatchMessage, msg[0], msg[1][1:], msg[2:], self.client_address, self.timestamp))
 		
-		for msg in decoded[2:]:
-			t = threading.Thread(target = self._unbundle, args = (msg,))
-			t.start()
-			children.append(t)
-			
-		# wait for all children to terminate
-		for t in children:
-			t.join()
+		# wait for all messages to be handled
+		for f in futures:
+			self.replies += f.result()
 		
 ######
 #
 # OSCServer classes
 #
 ######
+
+# The messages yielded by OSCServer.iter_messages(): 'tags' are without the leading ',',
+# 'source' is the sender's (host, port), 'timestamp' the arrival-time in nanoseconds since the Epoch,
+# and 'timetag' the NTPTime of the bundle carrying the message (0 if none).
+OSCReceivedMessage = collections.namedtuple('OSCReceivedMessage', ('address', 'tags', 'data', 'source', 'timestamp', 'timetag'))
+
 class OSCServer(UDPServer, OSCAddressSpace):
 	"""A Synchronous OSCServer
 	Serves one request at-a-time, until the OSCServer is closed.
@@ -1868,6 +3913,22 @@ class OSCServer(UDPServer, OSCAddressSpace):
 	# DEBUG: print error-tracebacks (to stderr)?
 	print_tracebacks = False
 	
+	# errors of the same kind from the same host are reported at most once per interval (in seconds)
+	error_report_interval = 5.
+	
+	# the maximum number of remote hosts errors are counted for separately. When more hosts cause errors,
+	# the counts of the least-recently erring host are merged into those of host 'other'
+	max_error_hosts = 256
+	
+	# the maximum number of OSC-addresses schema-rejects are counted for separately (see getSchemaRejects())
+	max_reject_addresses = 256
+	
+	# drop truncated or malformed packets without dispatching any of their contents?
+	strict_decoding = False
+	
+	# the maximum number of packets iter_messages() receives in one go
+	pull_batch_size = 1024
+	
 	def __init__(self, server_address, client=None, return_port=0):
 		"""Instantiate an OSCServer.
 		  - server_address ((host, port) tuple): the local host & UDP-port
@@ -1889,6 +3950,56 @@ class OSCServer(UDPServer, OSCAddressSpace):
 		self.running = False
 		self.client = None
 		
+		# holds bundles with a timetag in the future until they are due
+		self.scheduler = OSCScheduler()
+		
+		# collects replies for sending in bundles (see setReplyWindow())
+		self.reply_aggregator = None
+		
+		# per-source traffic control (see setRateLimit() & setFairQueuing())
+		self.rate_limiter = None
+		self.fair_queue = None
+		self._queue_thread = None
+		
+		# decouples receiving from decoding & dispatching (see setPacketRing())
+		self.packet_ring = None
+		self.ring_consumers = 0
+		
+		# take arrival-times from the kernel (see setKernelTimestamps())
+		self.kernel_timestamps = False
+		
+		# corrects bundle-timetags for remote clock-offsets (see setClockEstimation())
+		self.clock_estimator = None
+		
+		# releases incoming messages at a fixed delay (see setJitterBuffer())
+		self.jitter_buffer = None
+		self.jitter_per_address = False
+		
+		# counts lost, duplicate & reordered packets (see setSequenceTracking())
+		self.sequence_tracker = None
+		
+		# tuning of the serve_forever() thread (see setRealtime())
+		self.realtime_options = None
+		self.realtime_results = {}
+		
+		# non-blocking duplicate of the socket, for iter_messages()
+		self._pull_socket = None
+		
+		# typed address-schemas (see addSchema())
+		self.schemas = []
+		self._schema_cache = {}			# OSC-address -> OSCSchema or None
+		self.schema_rejects = collections.OrderedDict()	# OSC-address -> count, least-recently rejected first
+		self._reject_lock = threading.Lock()
+		
+		# rate-limited error-reporting (see handle_error())
+		self.error_counts = {}			# (kind, host) -> count
+		self._errors_suppressed = {}	# (kind, host) -> count, for the current interval
+		self._errors_reported = set()	# (kind, host) reported in the current interval
+		self._error_hosts = collections.OrderedDict()	# host -> set of kinds counted, least-recently erring first
+		self._error_interval_start = time.time()
+		self._error_lock = threading.Lock()
+		self.malformed_packets = 0
+		
 		if client == None:
 			self.client = OSCClient(server=self)
 		else:
@@ -1917,15 +4028,438 @@ class OSCServer(UDPServer, OSCAddressSpace):
 				self.return_port = client_address[1]
 
 	def serve_forever(self):
-		"""Handle one request at a time until server is closed."""
+		"""Handle one request at a time until server is closed.
+		If a packet-ring is set (see setPacketRing()), this thread only receives packets
+		into the ring, while the ring's consumer-threads handle them.
+		"""
 		self.running = True
+		if self.realtime_options != None:
+			self.realtime_results = setThreadRealtime(**self.realtime_options)
+		
+		if self.packet_ring != None:
+			self._serveRing(self.packet_ring)
+			return
+		
 		while self.running:
 			self.handle_request()	# this times-out when no data arrives.
 
+	def setRealtime(self, affinity=None, fifo_priority=None, nice=None):
+		"""Tune the thread running serve_forever() for low latency (see setThreadRealtime()).
+		The options are applied when serve_forever() starts; the results are then stored in 'realtime_results'.
+		Call setRealtime() without arguments to leave the thread untuned.
+		"""
+		if (affinity, fifo_priority, nice) == (None, None, None):
+			self.realtime_options = None
+		else:
+			self.realtime_options = {'affinity':affinity, 'fifo_priority':fifo_priority, 'nice':nice}
+
+	def get_request(self):
+		"""Receive a packet. Returns ((packet, socket, arrival-timestamp), client_address)
+		"""
+		(data, timestamp, client_address) = self._receive(self.socket)
+		return (data, self.socket, timestamp), client_address
+
+	def _receive(self, skt):
+		"""Receive a packet from the given socket. Returns (packet, arrival-timestamp, client_address)"""
+		timestamp = None
+		if self.kernel_timestamps:
+			(data, ancdata, _, client_address) = skt.recvmsg(self.max_packet_size, _timespec_cmsg_size)
+			timestamp = _kernelTimestamp(ancdata)
+		else:
+			(data, client_address) = skt.recvfrom(self.max_packet_size)
+		
+		if timestamp == None:
+			timestamp = time.time_ns()
+		
+		return (data, timestamp, client_address)
+
+	def iter_messages(self, timeout=None, batch=False):
+		"""Pull-based alternative to serve_forever(): a generator yielding the messages received by this server
+		as OSCReceivedMessage tuples, receiving & decoding them in the calling thread.
+		Registered callbacks are *not* called (but see dispatchMessage()). Bundles are unpacked right away;
+		their messages carry the bundle's timetag.
+		  - timeout (float): stop when no packet arrives within this many seconds.
+		  None (default) waits forever. 0 only yields the messages already pending, e.g. once per frame of a game-loop.
+		  - batch (bool): if True, yield lists of all messages pending at once, rather than one message at a time.
+		Don't use this while serve_forever() is running.
+		"""
+		while True:
+			if not select.select([self.socket], [], [], timeout)[0]:
+				return
+			
+			messages = self._drainMessages()
+			if batch:
+				if len(messages):
+					yield messages
+			else:
+				for message in messages:
+					yield message
+
+	async def aiter_messages(self, batch=False):
+		"""Asynchronous version of iter_messages(), for use with asyncio:
+		  >>> async for msg in server.aiter_messages():
+		  ...     print(msg.address, msg.data)
+		Waits for packets in the running event-loop, without blocking it.
+		"""
+		loop = asyncio.get_running_loop()
+		ready = asyncio.Event()
+		fd = self.socket.fileno()
+		loop.add_reader(fd, ready.set)
+		try:
+			while True:
+				await ready.wait()
+				ready.clear()
+				
+				messages = self._drainMessages()
+				if batch:
+					if len(messages):
+						yield messages
+				else:
+					for message in messages:
+						yield message
+		finally:
+			loop.remove_reader(fd)
+
+	def _drainMessages(self):
+		"""Receive & decode the packets pending on the server's socket, without blocking.
+		Returns a list of OSCReceivedMessage
+		"""
+		if self._pull_socket == None:
+			self._pull_socket = self.socket.dup()
+			self._pull_socket.setblocking(False)
+		
+		messages = []
+		for i in range(self.pull_batch_size):
+			try:
+				(data, timestamp, client_address) = self._receive(self._pull_socket)
+			except (BlockingIOError, InterruptedError):
+				break
+			
+			request = (data, self.socket, timestamp)
+			if not self.verify_request(request, client_address):
+				continue
+			
+			# like handle_request(), report packets that fail to decode, and carry on
+			received = []
+			try:
+				decoded = self.decodePacket(data, client_address)
+				if len(decoded):
+					self._collectMessages(decoded, NTPTime(0), client_address, timestamp, received)
+			except Exception:
+				self.handle_error(request, client_address)
+				continue
+			
+			messages += received
+		
+		return messages
+
+	def _collectMessages(self, decoded, timetag, client_address, timestamp, messages):
+		"""Recursively append the messages in the given decoded packet to 'messages', as OSCReceivedMessage"""
+		if not len(decoded):
+			return
+		
+		if decoded[0] != "#bundle":
+			messages.append(OSCReceivedMessage(decoded[0], decoded[1][1:], decoded[2:], client_address, timestamp, timetag))
+			return
+		
+		if decoded[1]:
+			timetag = decoded[1]
+		
+		for msg in decoded[2:]:
+			self._collectMessages(msg, timetag, client_address, timestamp, messages)
+
+	def setKernelTimestamps(self, enable=True):
+		"""Take the arrival-time of received packets from the kernel (using SO_TIMESTAMPNS),
+		rather than reading the clock after the packet has been received.
+		The arrival-time is passed to message-callbacks accepting a 'timestamp' keyword-argument,
+		as integer nanoseconds since the Epoch.
+		Only available on Linux. Raises OSCServerError if not supported.
+		"""
+		if SO_TIMESTAMPNS == None:
+			if enable:
+				raise OSCServerError("Kernel timestamps are not supported on %s" % sys.platform)
+			return
+		
+		try:
+			self.socket.setsockopt(socket.SOL_SOCKET, SO_TIMESTAMPNS, int(bool(enable)))
+		except socket.error as e:
+			raise OSCServerError("while enabling kernel timestamps: %s" % str(e))
+		
+		self.kernel_timestamps = bool(enable)
+		if self.packet_ring != None:
+			self.packet_ring.kernel_timestamps = self.kernel_timestamps
+
+	def setClockEstimation(self, window=32):
+		"""Estimate the clock-offset & drift of each remote host (see OSCClockEstimator),
+		from the last 'window' clock-sync messages received from it, and correct the timetags
+		of bundles from that host accordingly. A 'window' of 0 disables clock-estimation.
+		Remote hosts send clock-sync messages to the clockSync_handler, as registered by
+		addDefaultHandlers() (see also OSCClient.sendClockSync()).
+		"""
+		if window > 0:
+			self.clock_estimator = OSCClockEstimator(window)
+		else:
+			self.clock_estimator = None
+
+	def setJitterBuffer(self, target_delay=0.05, per_address=False):
+		"""Hand all incoming messages to a jitter-buffer (see OSCJitterBuffer), which dispatches them
+		'target_delay' seconds after the timetag of the bundle carrying them, or else after their arrival.
+		Messages are buffered per remote host, or per (host, OSC-address) if 'per_address' is set.
+		A 'target_delay' of 0 (or None) disables the jitter-buffer, discarding any messages it still holds.
+		"""
+		if self.jitter_buffer != None:
+			self.jitter_buffer.close()
+			self.jitter_buffer = None
+		
+		self.jitter_per_address = per_address
+		if target_delay:
+			self.jitter_buffer = OSCJitterBuffer(target_delay)
+
+	def getJitterStats(self):
+		"""Returns the jitter-buffer's per-stream statistics (see OSCJitterBuffer.getStats()),
+		or an empty dict if there is no jitter-buffer
+		"""
+		if self.jitter_buffer == None:
+			return {}
+		
+		return self.jitter_buffer.getStats()
+
+	def setSequenceTracking(self, mode='bundle'):
+		"""Track the sequence-numbers of packets from senders that number them (see OSCSequenceTracker),
+		removing the numbers before dispatching. Packets are tracked per (host, port).
+		  - mode ('bundle' | 'argument' | None): the sender's sequencing-mode (see OSCClient.setSequencing()).
+		  Note that in 'argument' mode, the trailing int argument of *every* OSCMessage not in a sequence-bundle
+		  is taken as a sequence-number. None (or False) disables sequence-tracking.
+		"""
+		if mode:
+			self.sequence_tracker = OSCSequenceTracker(mode)
+		else:
+			self.sequence_tracker = None
+
+	def getSequenceStats(self):
+		"""Returns the sequence-tracker's per-source statistics (see OSCSequenceTracker.getStats()),
+		or an empty dict if sequence-tracking is disabled
+		"""
+		if self.sequence_tracker == None:
+			return {}
+		
+		return self.sequence_tracker.getStats()
+
+	def addSchema(self, pattern, typetags):
+		"""Register a typed address-schema (see OSCSchema): OSCMessages sent to OSC-addresses matching 'pattern'
+		must carry exactly the given 'typetags' (e.g. addSchema('/user/*', 'fff')).
+		Messages that don't match the schema are counted (see getSchemaRejects()) and dropped before they reach any handler.
+		If more than one schema matches an OSC-address, the one registered first applies.
+		Registering a schema for an already registered pattern replaces it.
+		"""
+		self.delSchema(pattern)
+		self.schemas.append(OSCSchema(pattern, typetags))
+		self._schema_cache = {}
+
+	def delSchema(self, pattern):
+		"""Remove the schema registered for the given address-pattern
+		"""
+		self.schemas = [schema for schema in self.schemas if schema.pattern != pattern]
+		self._schema_cache = {}
+
+	def getSchema(self, address):
+		"""Returns the OSCSchema that applies to the given OSC-address, or None
+		"""
+		try:
+			return self._schema_cache[address]
+		except KeyError:
+			pass
+		
+		schema = None
+		for candidate in self.schemas:
+			if candidate.matches(address):
+				schema = candidate
+				break
+		
+		if len(self._schema_cache) >= 4096:
+			self._schema_cache = {}
+		self._schema_cache[address] = schema
+		return schema
+
+	def getSchemaRejects(self):
+		"""Returns a dict {OSC-address:count} with the number of messages rejected by schemas.
+		Rejects are counted for at most 'max_reject_addresses' OSC-addresses; those of the
+		least-recently rejected addresses are merged into the count of address 'other'
+		"""
+		with self._reject_lock:
+			return dict(self.schema_rejects)
+
+	def _rejectSchema(self, address):
+		"""Count a message rejected by a schema"""
+		with self._reject_lock:
+			_countPerKey(self.schema_rejects, address, self.max_reject_addresses)
+
+	def schemaDecode(self, packet):
+		"""Decode a binary OSC-message using the schema for its OSC-address.
+		Returns the decoded message (like decodeOSC()), or [] if the message was rejected by the schema.
+		Returns None if the packet is a bundle, or no schema with a precompiled struct applies to it,
+		in which case the packet must be decoded the normal way.
+		"""
+		if packet[:1] != b'/':
+			return None
+		
+		length = packet.find(b'\0')
+		if length < 0:
+			return None
+		
+		address = packet[:length].decode('latin1')
+		schema = self.getSchema(address)
+		if schema == None:
+			return None
+		
+		decoded = schema.decode(packet, address, (length + 4) & ~3)
+		if decoded == []:
+			self._rejectSchema(address)
+		
+		return decoded
+
+	def schemaCheck(self, decoded):
+		"""Check the decoded OSC-message or bundle against the registered schemas.
+		Returns the message, or [] if it was rejected. Messages in bundles are checked one-by-one,
+		returning the bundle without any rejected messages. Empty (address-only) elements are skipped.
+		"""
+		if not len(decoded):
+			return decoded
+		
+		if decoded[0] == "#bundle":
+			out = decoded[:2]
+			for msg in decoded[2:]:
+				msg = self.schemaCheck(msg)
+				if len(msg):
+					out.append(msg)
+			return out
+		
+		schema = self.getSchema(decoded[0])
+		if (schema != None) and (decoded[1] != ("," + schema.typetags)):
+			self._rejectSchema(decoded[0])
+			return []
+		
+		return decoded
+
+	def decodePacket(self, packet, client_address):
+		"""Decode a received packet, taking the server's decoding-settings (see 'strict_decoding',
+		setSequenceTracking() & addSchema()) into account. Returns the decoded packet (like decodeOSC()),
+		or [] if the packet is malformed or rejected.
+		"""
+		return self._decodeSequenced(packet, client_address)[0]
+	
+	def _decodeSequenced(self, packet, client_address):
+		"""Like decodePacket(), but returns a (decoded packet, sequence-number) tuple.
+		The sequence-number is None unless sequence-tracking is enabled and the packet carries one.
+		"""
+		decoded = None
+		if len(self.schemas) and ((self.sequence_tracker == None) or (self.sequence_tracker.mode != 'argument')):
+			decoded = self.schemaDecode(packet)
+		
+		if decoded != None:
+			return (decoded, None)
+		
+		try:
+			decoded = decodeOSC(packet, self.strict_decoding)
+		except OSCDecodeError as e:
+			self.countMalformed(client_address, e)
+			return ([], None)
+		
+		seq = None
+		if len(decoded) and (self.sequence_tracker != None):
+			(decoded, seq) = self.sequence_tracker.split(decoded, client_address)
+		
+		if len(decoded) and len(self.schemas):
+			decoded = self.schemaCheck(decoded)
+		
+		return (decoded, seq)
+
+	def bundleDueTime(self, timetag, client_address):
+		"""Returns the local time (in floating seconds since the Epoch) at which a bundle with the given
+		timetag (an NTPTime), received from the given client, is due.
+		Returns 0.0 for 'immediately'.
+		"""
+		if not timetag:
+			return 0.0
+		
+		if self.clock_estimator != None:
+			return self.clock_estimator.toLocal(client_address[0], timetag.ns()) / 1e9
+		
+		return timetag.seconds()
+
+	def _handlePacket(self, request, client_address):
+		"""Verify & process a received request (like socketserver's _handle_request_noblock())"""
+		if self.verify_request(request, client_address):
+			try:
+				self.process_request(request, client_address)
+			except Exception:
+				self.handle_error(request, client_address)
+				self.shutdown_request(request)
+		else:
+			self.shutdown_request(request)
+
+	def setPacketRing(self, slots=1024, consumers=1):
+		"""Have serve_forever() receive packets into a preallocated ring-buffer of 'slots' packets
+		(see OSCPacketRing), to be decoded & dispatched by 'consumers' separate threads.
+		The consumers handle packets concurrently, so with more than one consumer, packets may
+		be dispatched out of order.
+		If slots is 0, packets are handled by the receiving thread.
+		Must be called before serve_forever().
+		"""
+		if slots > 0:
+			self.packet_ring = OSCPacketRing(slots, self.max_packet_size)
+			self.packet_ring.kernel_timestamps = self.kernel_timestamps
+			self.ring_consumers = max(consumers, 1)
+		else:
+			self.packet_ring = None
+			self.ring_consumers = 0
+
+	def _serveRing(self, ring):
+		"""Receive packets into the packet-ring until the server is closed"""
+		consumers = []
+		for i in range(self.ring_consumers):
+			t = threading.Thread(target=self._consumeRing, args=(ring,), name="OSCServer ring-consumer %d" % i)
+			t.daemon = True
+			t.start()
+			consumers.append(t)
+		
+		try:
+			while self.running:
+				try:
+					ring.receive(self.socket)
+				except socket.timeout:
+					continue
+				except socket.error:
+					if self.running:
+						raise
+		finally:
+			ring.close()
+			for t in consumers:
+				t.join()
+
+	def _consumeRing(self, ring):
+		"""Packet-ring consumer thread main loop"""
+		while True:
+			packet = ring.get()
+			if packet == None:
+				return
+			
+			(data, client_address, timestamp) = packet
+			self._handlePacket((data, self.socket, timestamp), client_address)
+
 	def close(self):
 		"""Stops serving requests, closes server (socket), closes used client
 		"""
 		self.running = False
+		self.flushErrorSummary()
+		self.setFairQueuing(0)
+		self.scheduler.stop()
+		self.setJitterBuffer(0)
+		if self.reply_aggregator != None:
+			self.reply_aggregator.close()
+		if self._pull_socket != None:
+			self._pull_socket.close()
+			self._pull_socket = None
 		self.client.close()
 		self.server_close()
 	
@@ -1964,6 +4498,35 @@ class OSCServer(UDPServer, OSCAddressSpace):
 		except socket.error:
 			return None
 	
+	def _multicastRequest(self, group, interface):
+		"""Returns the 'ip_mreq' struct used to join or leave a multicast group"""
+		try:
+			return struct.pack("4s4s", socket.inet_aton(group), socket.inet_aton(interface))
+		except socket.error:
+			raise OSCServerError("Invalid multicast group '%s' or interface '%s'" % (group, interface))
+
+	def joinMulticastGroup(self, group, interface='0.0.0.0'):
+		"""Join the (IPv4) multicast group with the given address, so the server receives
+		the packets sent to the group on the port the server is bound to.
+		For this, the server should be bound to '' or '0.0.0.0' (or the group's address).
+		  - interface (string): the IP-address of the local interface to join the group on.
+		  '0.0.0.0' (default) lets the kernel choose the interface.
+		To have several servers on the same host receive the same group & port, set the
+		(socketserver) 'allow_reuse_address' class-attribute to True before instantiating them.
+		"""
+		try:
+			self.socket.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, self._multicastRequest(group, interface))
+		except socket.error as e:
+			raise OSCServerError("while joining multicast group %s: %s" % (group, str(e)))
+
+	def leaveMulticastGroup(self, group, interface='0.0.0.0'):
+		"""Leave a multicast group joined with joinMulticastGroup()
+		"""
+		try:
+			self.socket.setsockopt(socket.IPPROTO_IP, socket.IP_DROP_MEMBERSHIP, self._multicastRequest(group, interface))
+		except socket.error as e:
+			raise OSCServerError("while leaving multicast group %s: %s" % (group, str(e)))
+
 	def setReturnPort(self, port):
 		"""Set the destination UDP-port for replies returning from this server to the remote client
 		"""
@@ -1973,6 +4536,95 @@ class OSCServer(UDPServer, OSCAddressSpace):
 			self.return_port = None
 			
 
+	def setReplyWindow(self, window, mtu=1472):
+		"""Collect the replies to each remote client for 'window' seconds, and send them
+		together in OSCBundles of at most 'mtu' bytes (see OSCReplyAggregator).
+		If window is 0 (default), replies are sent right after each request is handled.
+		"""
+		if self.reply_aggregator != None:
+			self.reply_aggregator.close()
+		
+		if window > 0:
+			self.reply_aggregator = OSCReplyAggregator(self.client, window, mtu)
+		else:
+			self.reply_aggregator = None
+
+	def setRateLimit(self, rate, burst=None):
+		"""Limit the number of packets handled per remote host to 'rate' packets per second,
+		allowing bursts of up to 'burst' packets (see OSCSourceLimiter).
+		Packets exceeding the limit are dropped before being decoded.
+		If rate is 0 or None, rate-limiting is disabled.
+		"""
+		if rate:
+			self.rate_limiter = OSCSourceLimiter(rate, burst)
+		else:
+			self.rate_limiter = None
+
+	def setFairQueuing(self, queue_size=64):
+		"""Queue received packets per remote host, and handle the hosts' packets in turn
+		(see OSCFairQueue), on a separate dispatching thread.
+		Up to 'queue_size' packets are queued per host; further packets are dropped.
+		If queue_size is 0, fair-queuing is disabled and packets are handled in order of arrival.
+		Note: the ThreadingOSCServer handles each packet in its own thread, and does not use fair-queuing.
+		"""
+		if self.fair_queue != None:
+			self.fair_queue.close()
+			if self._queue_thread != threading.current_thread():
+				self._queue_thread.join()
+			self.fair_queue = None
+			self._queue_thread = None
+		
+		if queue_size > 0:
+			self.fair_queue = OSCFairQueue(queue_size)
+			self._queue_thread = threading.Thread(target=self._dispatchQueued, args=(self.fair_queue,), name="OSCServer fair-queue")
+			self._queue_thread.daemon = True
+			self._queue_thread.start()
+
+	def getDropCounts(self):
+		"""Returns a dict {host:count} with the number of packets dropped per remote host
+		by the rate-limiter and the fair-queue. Drops of hosts that haven't dropped packets for a while
+		may be counted under host 'other' (see OSCSourceLimiter.max_drop_sources)
+		"""
+		out = {}
+		for limiter in (self.rate_limiter, self.fair_queue):
+			if limiter == None:
+				continue
+			for (source, count) in list(limiter.drops.items()):
+				out[source] = out.get(source, 0) + count
+		
+		return out
+
+	def verify_request(self, request, client_address):
+		"""Drop packets from remote hosts exceeding the rate-limit (see setRateLimit())
+		"""
+		if self.rate_limiter != None:
+			return self.rate_limiter.allow(client_address[0])
+		
+		return True
+
+	def process_request(self, request, client_address):
+		"""Handle the request, or queue it for the fair-queue's dispatching thread (see setFairQueuing())
+		"""
+		if self.fair_queue != None:
+			self.fair_queue.put(client_address[0], (request, client_address))
+		else:
+			UDPServer.process_request(self, request, client_address)
+
+	def _dispatchQueued(self, queue):
+		"""Fair-queue dispatching thread main loop"""
+		while True:
+			entry = queue.get()
+			if entry == None:
+				return
+			
+			(request, client_address) = entry[1]
+			try:
+				self.finish_request(request, client_address)
+			except Exception:
+				self.handle_error(request, client_address)
+			finally:
+				self.shutdown_request(request)
+
 	def setSrvInfoPrefix(self, pattern):
 		"""Set the first part of OSC-address (pattern) this server will use to reply to server-info requests.
 		"""
@@ -1999,6 +4651,7 @@ class OSCServer(UDPServer, OSCAddressSpace):
 		- '<prefix><info_prefix' ->  serverInfo_handler
 		- '<prefix><error_prefix> ->  msgPrinter_handler
 		- '<prefix>/print' ->  msgPrinter_handler
+		- '<prefix>/clock' ->  clockSync_handler
 		and, if the used Client supports it;
 		- '<prefix>/subscribe' -> subscription_handler
 		- '<prefix>/unsubscribe' -> subscription_handler
@@ -2018,6 +4671,7 @@ class OSCServer(UDPServer, OSCAddressSpace):
 		self.addMsgHandler(prefix + info_prefix, self.serverInfo_handler)
 		self.addMsgHandler(prefix + error_prefix, self.msgPrinter_handler)
 		self.addMsgHandler(prefix + '/print', self.msgPrinter_handler)
+		self.addMsgHandler(prefix + '/clock', self.clockSync_handler)
 		
 		if isinstance(self.client, OSCMultiClient):
 			self.addMsgHandler(prefix + '/subscribe', self.subscription_handler)
@@ -2059,6 +4713,112 @@ class OSCServer(UDPServer, OSCAddressSpace):
 		if len(self.error_prefix):
 			self.sendOSCerror(txt, client_address)
 	
+	def _countError(self, kind, client_address):
+		"""Count an error of the given kind (a string) caused by a request from the given address.
+		Returns True if the error should be reported, i.e. if it is the first error of this kind
+		from this host in the current interval (see 'error_report_interval').
+		The errors not reported are summarized when the interval has passed.
+		"""
+		host = client_address[0]
+		key = (kind, host)
+		now = time.time()
+		summary = None
+		with self._error_lock:
+			kinds = self._error_hosts.get(host)
+			if kinds == None:
+				if len(self._error_hosts) >= self.max_error_hosts:
+					self._forgetErrorHost()
+				kinds = set()
+				self._error_hosts[host] = kinds
+			else:
+				self._error_hosts.move_to_end(host)
+			kinds.add(kind)
+			
+			self.error_counts[key] = self.error_counts.get(key, 0) + 1
+			
+			if (now - self._error_interval_start) >= self.error_report_interval:
+				summary = self._errors_suppressed
+				self._errors_suppressed = {}
+				self._errors_reported = set()
+				self._error_interval_start = now
+			
+			if key in self._errors_reported:
+				if not len(self._errors_suppressed):
+					# make sure the summary gets printed, even if no further errors arrive
+					self.scheduler.schedule(self._error_interval_start + self.error_report_interval, self._summaryDue)
+				self._errors_suppressed[key] = self._errors_suppressed.get(key, 0) + 1
+				report = False
+			else:
+				self._errors_reported.add(key)
+				report = True
+		
+		if summary:
+			self._printErrorSummary(summary)
+		
+		return report
+	
+	def _forgetErrorHost(self):
+		"""Merge the error-counts of the least-recently erring host into those of host 'other'.
+		Must be called holding the error-lock"""
+		(host, kinds) = self._error_hosts.popitem(last=False)
+		if host == 'other':
+			self._error_hosts['other'] = kinds
+			(host, kinds) = self._error_hosts.popitem(last=False)
+		
+		other = self._error_hosts.setdefault('other', set())
+		for kind in kinds:
+			other.add(kind)
+			count = self.error_counts.pop((kind, host), 0)
+			self.error_counts[(kind, 'other')] = self.error_counts.get((kind, 'other'), 0) + count
+			count = self._errors_suppressed.pop((kind, host), 0)
+			if count:
+				self._errors_suppressed[(kind, 'other')] = self._errors_suppressed.get((kind, 'other'), 0) + count
+			self._errors_reported.discard((kind, host))
+	
+	def _summaryDue(self):
+		"""Called by the scheduler when an interval with suppressed errors has passed"""
+		with self._error_lock:
+			if (time.time() - self._error_interval_start) < self.error_report_interval:
+				return
+			summary = self._errors_suppressed
+			self._errors_suppressed = {}
+			self._errors_reported = set()
+			self._error_interval_start = time.time()
+		
+		self._printErrorSummary(summary)
+	
+	def _printErrorSummary(self, suppressed):
+		"""Print the number of errors suppressed per kind & host"""
+		for ((kind, host), count) in list(suppressed.items()):
+			self.printErr("%d more %s error(s) from %s suppressed" % (count, kind, host))
+	
+	def flushErrorSummary(self):
+		"""Print a summary of the errors suppressed so far in the current interval,
+		and start a new interval
+		"""
+		with self._error_lock:
+			summary = self._errors_suppressed
+			self._errors_suppressed = {}
+			self._errors_reported = set()
+			self._error_interval_start = time.time()
+		
+		self._printErrorSummary(summary)
+	
+	def countMalformed(self, client_address, error):
+		"""Count a malformed packet received from the given address, which is dropped
+		(see 'strict_decoding'). Reported like any other error (see handle_error()), without
+		sending an error-message to the client.
+		"""
+		self.malformed_packets += 1
+		if self._countError(error.__class__.__name__, client_address):
+			self.printErr("Malformed packet from %s: %s" % (getUrlStr(client_address), str(error)))
+	
+	def getErrorCounts(self):
+		"""Returns a dict {(kind, host):count} with the number of errors counted per kind & remote host
+		"""
+		with self._error_lock:
+			return dict(self.error_counts)
+	
 	def sendOSCinfo(self, txt, client_address):
 		"""Sends 'txt', encapsulated in an OSCMessage to the default 'info_prefix' OSC-addres.
 		Message is sent to the given client_address, with the default 'return_port' overriding
@@ -2087,9 +4847,13 @@ class OSCServer(UDPServer, OSCAddressSpace):
 	def handle_error(self, request, client_address):
 		"""Handle an exception in the Server's callbacks gracefully.
 		Writes the error to sys.stderr and, if the error_prefix (see setSrvErrorPrefix()) is set,
-		sends the error-message as reply to the client
+		sends the error-message as reply to the client.
+		Repeated errors are counted, and reported at most once per 'error_report_interval'
 		"""
 		(e_type, e) = sys.exc_info()[:2]
+		if not self._countError(e_type.__name__, client_address):
+			return
+		
 		self.printErr("%s on request from %s: %s" % (e_type.__name__, getUrlStr(client_address), str(e)))
 
 		if self.print_tracebacks:
@@ -2113,9 +4877,13 @@ class OSCServer(UDPServer, OSCAddressSpace):
 		a Message-handler function may return None, but it could also return an OSCMessage (or OSCBundle),
 		which then gets sent back to the client.
 		
-		This handler prints a "No callback registered to handle ..." message.
+		This handler prints a "No callback registered to handle ..." message,
+		at most once per 'error_report_interval' for each remote host.
 		Returns None
 		"""
+		if not self._countError(NoCallbackError.__name__, client_address):
+			return
+		
 		self.reportErr("No callback registered to handle OSC-address '%s'" % addr, client_address)
 		
 	def msgPrinter_handler(self, addr, tags, data, client_address):
@@ -2140,6 +4908,30 @@ class OSCServer(UDPServer, OSCAddressSpace):
 			
 		self.printErr(txt)	# strip trailing comma & space
 	
+	def clockSync_handler(self, addr, tags, data, client_address, timestamp=None):
+		"""Example handler for OSCMessages.
+		All registerd handlers must accept these three arguments:
+		- addr (string): The OSC-address pattern of the received Message
+		  (the 'addr' string has already been matched against the handler's registerd OSC-address,
+		  but may contain '*'s & such)
+		- tags (string):  The OSC-typetags of the received message's arguments. (without the preceding comma)
+		- data (list): The OSCMessage's arguments
+		  Note that len(tags) == len(data)
+		- client_address ((host, port) tuple): the host & port this message originated from.
+		
+		a Message-handler function may return None, but it could also return an OSCMessage (or OSCBundle),
+		which then gets sent back to the client.
+		
+		This handler takes the message's first argument, a timetag holding the remote host's clock
+		at send-time, as a sample for the clock-estimator (see setClockEstimation()),
+		together with the message's arrival-time.
+		Returns None
+		"""
+		if (self.clock_estimator == None) or (not len(tags)) or (tags[0] != 't') or (not data[0]):
+			return
+		
+		self.clock_estimator.addSample(client_address[0], data[0].ns(), timestamp)
+	
 	def serverInfo_handler(self, addr, tags, data, client_address):
 		"""Example handler for OSCMessages.
 		All registerd handlers must accept these three arguments:
@@ -2210,7 +5002,7 @@ class OSCServer(UDPServer, OSCAddressSpace):
 			elif isinstance(item,str):
 				url += item
 
-		(addr, tail) = parseUrlStr(url)
+		(addr, tail) = parseUrlStr(url, resolve=False)
 		(prefix, filters) = parseFilterStr(tail)
 		
 		if addr != None:
@@ -2219,10 +5011,14 @@ class OSCServer(UDPServer, OSCAddressSpace):
 				host = client_address[0]
 			if not port:
 				port = client_address[1]
-			addr = (host, port)
 		else:
-			addr = client_address
+			(host, port) = client_address[:2]
 		
+		return self._withResolvedHost(host, client_address, self._addSubscription, port, prefix, filters)
+	
+	def _addSubscription(self, host, port, prefix, filters):
+		"""Subscribe the given (resolved) host & port. Returns the reply"""
+		addr = (host, port)
 		self.client._setTarget(addr, prefix, filters)
 	
 		trg = self.client.getOSCTargetStr(addr)
@@ -2230,6 +5026,27 @@ class OSCServer(UDPServer, OSCAddressSpace):
 			reply = OSCMessage(self.info_prefix)
 			reply.append(('target',) + trg)
 			return reply
+	
+	def _withResolvedHost(self, host, client_address, handler, *args):
+		"""Call 'handler(host, *args)' with the given host resolved to an IP-address, and return its reply.
+		A host-name that isn't cached by the resolver is looked up by the resolver's worker-thread, so a
+		remote request never blocks the server on DNS; the handler is then called from that thread, and
+		its reply is sent to the given client_address (with the default 'return_port' overriding its port, if defined).
+		"""
+		def resolved(address):
+			reply = handler(address, *args)
+			if reply != None:
+				reply_address = client_address
+				if self.return_port:
+					reply_address = (reply_address[0], self.return_port)
+				if self.reply_aggregator != None:
+					self.reply_aggregator.add(reply, reply_address)
+				else:
+					self.client.sendto(reply, reply_address)
+		
+		address = resolver.nameToAddrLater(host, resolved)
+		if address != None:
+			return handler(address, *args)
 		
 	def _unsubscribe(self, data, client_address):
 		"""Handle the actual unsubscription. the provided 'data' is concatenated together to form a
@@ -2248,22 +5065,26 @@ class OSCServer(UDPServer, OSCAddressSpace):
 			elif isinstance(item,str):
 				url += item
 
-		(addr, _) = parseUrlStr(url)
+		(addr, _) = parseUrlStr(url, resolve=False)
 		
 		if addr == None:
-			addr = client_address
+			(host, port) = client_address[:2]
 		else:
 			(host, port) = addr
 			if not host:
 				host = client_address[0]
-			if not port:
-				try:
-					(host, port) = self.client._searchHostAddr(host)
-				except NotSubscribedError:
-					port = client_address[1]
-					
-			addr = (host, port)
 		
+		return self._withResolvedHost(host, client_address, self._removeSubscription, port, client_address)
+	
+	def _removeSubscription(self, host, port, client_address):
+		"""Unsubscribe the given (resolved) host & port. Returns the reply, if any"""
+		if not port:
+			try:
+				(host, port) = self.client._searchHostAddr(host)
+			except NotSubscribedError:
+				port = client_address[1]
+		
+		addr = (host, port)
 		try:
 			self.client._delTarget(addr)
 		except NotSubscribedError as e:
@@ -2339,6 +5160,34 @@ class OSCServer(UDPServer, OSCAddressSpace):
 			return self._unsubscribe(data, client_address)
 
 
+class ThreadingOSCServer(ThreadingMixIn, OSCServer):
+	"""An Asynchronous OSCServer.
+	This server starts a new thread to handle each incoming request.
+	The messages contained in a bundle are handed to a bounded pool of re-usable worker-threads.
+	"""
+	# set the RequestHandlerClass, will be overridden by ForkingOSCServer & ThreadingOSCServer
+	RequestHandlerClass = ThreadingOSCRequestHandler
+	
+	# the maximum number of worker-threads handling bundled messages
+	bundle_workers = 8
+	
+	# if True, bundled messages are handled one-by-one, in order of appearance
+	ordered_bundles = False
+	
+	def __init__(self, server_address, client=None, return_port=0):
+		"""Instantiate a ThreadingOSCServer.
+		(see OSCServer.__init__())
+		"""
+		self.pool = ThreadPoolExecutor(max_workers=self.bundle_workers)
+		OSCServer.__init__(self, server_address, client, return_port)
+	
+	def close(self):
+		"""Stops serving requests, closes server (socket), closes used client,
+		shuts down the worker-pool
+		"""
+		OSCServer.close(self)
+		self.pool.shutdown(wait=False)
+
 ######
 #
 # OSCError classes
@@ -2364,6 +5213,11 @@ class OSCServerError(OSCError):
 	"""
 	pass
 
+class OSCDecodeError(OSCError):
+	"""This error is raised by decodeOSC() (in strict mode) when a packet is truncated or malformed
+	"""
+	pass
+
 class NoCallbackError(OSCServerError):
 	"""This error is raised (by an OSCServer) when an OSCMessage with an 'unmatched' address-pattern
 	is received, and no 'default' handler is registered.
@@ -2404,7 +5258,155 @@ class NotSubscribedError(OSCClientError):
 # 
 ######
 				
-class OSCStreamRequestHandler(StreamRequestHandler, OSCAddressSpace):
+class OSCStreamWriter(object):
+	"""Mixin writing length-prefixed OSC-packets to a stream (TCP) socket, for OSCStreamRequestHandler & OSCStreamingClient.
+	Each packet's length-prefix is packed with a single struct.pack(), and written together with the packet
+	in one sendmsg() (or, where that isn't available, one send() of the joined data).
+	With a 'flush_interval' > 0, packets are held for at most 'flush_interval' seconds and written together,
+	as long as the held data stays below 'coalesce_size' bytes. This cuts the number of TCP-segments sent
+	for lots of small messages. Packets are always written in the order they were sent.
+	Held packets are written by a single flusher-thread per stream, started when first needed. An error
+	raised while it writes is kept, and raised by the next call sending a packet, or by flush().
+	Classes using this must call _initWriter() (after creating '_txMutex'), hold '_txMutex' while writing,
+	call _closeWriter() when done, and implement _streamSocket() (returning the socket to write to) &
+	_keepTrying() (returning True to keep retrying after a socket-timeout).
+	"""
+	flush_interval = 0.
+	coalesce_size = 1400
+	
+	# a struct for packing the length-prefix of packets
+	_length = struct.Struct('>L')
+	
+	def _initWriter(self):
+		"""Initialize the write-coalescing state"""
+		self._pending = []
+		self._pending_size = 0
+		self._flush_due = None		# monotonic time the held packets are due, or None
+		self._flush_cond = threading.Condition(self._txMutex)
+		self._flusher = None
+		self._writer_closed = False
+		self._write_error = None	# error raised while writing held packets
+	
+	def _raiseWriteError(self):
+		"""Raise the error kept from writing held packets, if any. Must be called holding '_txMutex'"""
+		error = self._write_error
+		if error != None:
+			self._write_error = None
+			raise error
+	
+	def _writeMsg(self, msg):
+		"""Frame & write (or hold) the given OSCMessage or OSCBundle. Must be called holding '_txMutex'.
+		Returns False if the socket was closed.
+		"""
+		if not isinstance(msg, OSCMessage):
+			raise TypeError("'msg' argument is not an OSCMessage or OSCBundle object")
+		
+		self._raiseWriteError()
+		
+		binary = msg.getBinary()
+		prefix = self._length.pack(len(binary))
+		size = len(binary) + 4
+		
+		if (self.flush_interval > 0) and (self._pending_size + size < self.coalesce_size) and not self._writer_closed:
+			self._pending.append(prefix)
+			self._pending.append(binary)
+			self._pending_size += size
+			if self._flush_due == None:
+				self._flush_due = time.monotonic() + self.flush_interval
+				if self._flusher == None:
+					self._flusher = threading.Thread(target=self._runFlusher, name=self.__class__.__name__ + " flusher")
+					self._flusher.daemon = True
+					self._flusher.start()
+				self._flush_cond.notify()
+			return True
+		
+		frames = [prefix, binary]
+		if len(self._pending):
+			frames.insert(0, self._takePending())
+		
+		return self._writeFrames(frames)
+	
+	def _takePending(self):
+		"""Returns the held data, joined, and clears it. Must be called holding '_txMutex'"""
+		data = b"".join(self._pending)
+		self._pending = []
+		self._pending_size = 0
+		self._flush_due = None
+		return data
+	
+	def _runFlusher(self):
+		"""Flusher-thread main loop: writes the held packets when they are due"""
+		with self._flush_cond:
+			while not self._writer_closed:
+				if self._flush_due == None:
+					self._flush_cond.wait()
+					continue
+				
+				delay = self._flush_due - time.monotonic()
+				if delay > 0:
+					self._flush_cond.wait(delay)
+					continue
+				
+				try:
+					if not self._writeFrames([self._takePending()]):
+						self._write_error = BrokenPipeError(errno.EPIPE, "stream closed while writing held packets")
+				except socket.error as e:
+					self._write_error = e
+	
+	def _writeFrames(self, frames):
+		"""Write the given list of byte-strings to the socket, in a single system-call if possible.
+		Returns False if the socket was closed, or if it timed out and _keepTrying() returned False.
+		"""
+		skt = self._streamSocket()
+		total = sum(map(len, frames))
+		sent = 0
+		while True:
+			try:
+				if hasattr(skt, 'sendmsg'):
+					count = skt.sendmsg(frames)
+				else:
+					count = skt.send(b"".join(frames))
+			except socket.timeout:
+				if not self._keepTrying():
+					return False
+				continue
+			
+			if count == 0:
+				return False
+			
+			sent += count
+			if sent >= total:
+				return True
+			
+			# partial write; continue with the remainder
+			frames = [memoryview(b"".join(frames))[count:]]
+	
+	def flush(self):
+		"""Write any held packets now. Returns False if the socket was closed.
+		Raises the error kept from an earlier write of held packets, if any.
+		"""
+		with self._txMutex:
+			self._raiseWriteError()
+			if not len(self._pending):
+				return True
+			
+			return self._writeFrames([self._takePending()])
+	
+	def _closeWriter(self):
+		"""Stop the flusher-thread, and write any held packets (ignoring errors)"""
+		with self._flush_cond:
+			self._writer_closed = True
+			self._flush_cond.notify()
+		
+		if (self._flusher != None) and (self._flusher != threading.current_thread()):
+			self._flusher.join()
+		
+		try:
+			self.flush()
+		except socket.error:
+			pass
+
+class OSCStreamRequestHandler(StreamRequestHandler, OSCStreamWriter, OSCAddressSpace):
 	""" This is the central class of a streaming OSC server. If a client
 	connects to the server, the server instantiates a OSCStreamRequestHandler
 	for each new connection. This is fundamentally different to a packet
@@ -2426,6 +5428,7 @@ class OSCStreamRequestHandler(StreamRequestHandler, OSCAddressSpace):
 		requires an already initialized address space.
 		""" 
 		self._txMutex = threading.Lock()
+		self._initWriter()
 		OSCAddressSpace.__init__(self)
 		StreamRequestHandler.__init__(self, request, client_address, server)
 
@@ -2436,7 +5439,7 @@ class OSCStreamRequestHandler(StreamRequestHandler, OSCAddressSpace):
 			return
 		
 		now = time.time()
-		timetag = decoded[1]
+		timetag = decoded[1].seconds()
 		if (timetag > 0.) and (timetag > now):
 			time.sleep(timetag - now)
 		
@@ -2454,37 +5457,25 @@ class OSCStreamRequestHandler(StreamRequestHandler, OSCAddressSpace):
 		pass
 	
 	def finish(self):
+		self._closeWriter()
 		StreamRequestHandler.finish(self)
 		self.server._clientUnregister(self)
 		print("SERVER: Client connection handled.")
-	def _transmit(self, data):
-		sent = 0
-		while sent < len(data):
-			tmp = self.connection.send(data[sent:])
-			if tmp == 0:
-				return False
-			sent += tmp
-		return True
+	def _streamSocket(self):
+		return self.connection
+	
+	def _keepTrying(self):
+		return False
+	
 	def _transmitMsg(self, msg):
 		"""Send an OSC message over a streaming socket. Raises exception if it
 		should fail. If everything is transmitted properly, True is returned. If
 		socket has been closed, False.
 		"""
-		if not isinstance(msg, OSCMessage):
-			raise TypeError("'msg' argument is not an OSCMessage or OSCBundle object")
-
 		try:
-			binary = msg.getBinary()
-			length = len(binary)
-			# prepend length of packet before the actual message (big endian)
-			len_big_endian = array.array('c', '\0' * 4)
-			struct.pack_into(">L", len_big_endian, 0, length)
-			len_big_endian = len_big_endian.tostring()
-			if self._transmit(len_big_endian) and self._transmit(binary):
-				return True
-			return False			
+			return self._writeMsg(msg)
 		except socket.error as e:
-			if e[0] == errno.EPIPE: # broken pipe
+			if e.errno == errno.EPIPE: # broken pipe
 				return False
 			raise e
 
@@ -2558,14 +5549,13 @@ class OSCStreamRequestHandler(StreamRequestHandler, OSCAddressSpace):
 				else:
 					# no replies, continue receiving
 					continue
-				self._txMutex.acquire()
-				txOk = self._transmitMsg(msg)
-				self._txMutex.release()
+				with self._txMutex:
+					txOk = self._transmitMsg(msg)
 				if not txOk:
 					break
 		
 		except socket.error as e:
-			if e[0] == errno.ECONNRESET:
+			if e.errno == errno.ECONNRESET:
 				# if connection has been reset by client, we do not care much
 				# about it, we just assume our duty fullfilled
 				print("SERVER: Connection has been reset by peer.")
@@ -2576,9 +5566,8 @@ class OSCStreamRequestHandler(StreamRequestHandler, OSCAddressSpace):
 		""" This member can be used to transmit OSC messages or OSC bundles
 		over the client/server connection. It is thread save.
 		"""
-		self._txMutex.acquire()
-		result = self._transmitMsg(oscData)
-		self._txMutex.release()
+		with self._txMutex:
+			result = self._transmitMsg(oscData)
 		return result
 
 """ TODO Note on threaded unbundling for streaming (connection oriented)
@@ -2675,7 +5664,7 @@ class OSCStreamingServerThreading(ThreadingMixIn, OSCStreamingServer):
 	the same. 
 	"""
 
-class OSCStreamingClient(OSCAddressSpace):
+class OSCStreamingClient(OSCStreamWriter, OSCAddressSpace):
 	""" OSC streaming client.
 	A streaming client establishes a connection to a streaming server but must
 	be able to handle replies by the server as well. To accomplish this the
@@ -2694,6 +5683,7 @@ class OSCStreamingClient(OSCAddressSpace):
 
 	def __init__(self):
 		self._txMutex = threading.Lock()
+		self._initWriter()
 		OSCAddressSpace.__init__(self)
 		self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
 		self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.sndbuf_size)
@@ -2702,7 +5692,7 @@ class OSCStreamingClient(OSCAddressSpace):
 		self._running = False
 		
 	def _receiveWithTimeout(self, count):
-		chunk = str()
+		chunk = b""
 		while len(chunk) < count:
 			try:
 				tmp = self.socket.recv(count - len(chunk))
@@ -2713,7 +5703,7 @@ class OSCStreamingClient(OSCAddressSpace):
 				else:
 					continue
 			except socket.error as e:
-				if e[0] == errno.ECONNRESET:
+				if e.errno == errno.ECONNRESET:
 					print("CLIENT: Connection reset by peer.")
 					return None
 				else:
@@ -2763,9 +5753,8 @@ class OSCStreamingClient(OSCAddressSpace):
 				msg = self.replies[0]
 			else:
 				continue
-			self._txMutex.acquire()
-			txOk = self._transmitMsgWithTimeout(msg)
-			self._txMutex.release()
+			with self._txMutex:
+				txOk = self._transmitMsgWithTimeout(msg)
 			if not txOk:
 				break
 		print("CLIENT: Receiving thread terminated.")
@@ -2776,7 +5765,7 @@ class OSCStreamingClient(OSCAddressSpace):
 			return
 		
 		now = time.time()
-		timetag = decoded[1]
+		timetag = decoded[1].seconds()
 		if (timetag > 0.) and (timetag > now):
 			time.sleep(timetag - now)
 		
@@ -2789,53 +5778,35 @@ class OSCStreamingClient(OSCAddressSpace):
 		self.receiving_thread.start()
 		
 	def close(self):
+		self._closeWriter()
 		# let socket time out
 		self._running = False
 		self.receiving_thread.join()
 		self.socket.close()
 
-	def _transmitWithTimeout(self, data):
-		sent = 0
-		while sent < len(data):
-			try:
-				tmp = self.socket.send(data[sent:])
-			except socket.timeout:
-				if not self._running:
-					print("CLIENT: Socket timed out and termination requested.")
-					return False
-				else:
-					continue
-			except socket.error as e:
-				if e[0] == errno.ECONNRESET:
-					print("CLIENT: Connection reset by peer.")
-					return False
-				else:
-					raise e
-			if tmp == 0:
-				return False
-			sent += tmp
-		return True
+	def _streamSocket(self):
+		return self.socket
+	
+	def _keepTrying(self):
+		if not self._running:
+			print("CLIENT: Socket timed out and termination requested.")
+		return self._running
 		
 	def _transmitMsgWithTimeout(self, msg):
-		if not isinstance(msg, OSCMessage):
-			raise TypeError("'msg' argument is not an OSCMessage or OSCBundle object")
-		binary = msg.getBinary()
-		length = len(binary)
-		# prepend length of packet before the actual message (big endian)
-		len_big_endian = array.array('c', '\0' * 4)
-		struct.pack_into(">L", len_big_endian, 0, length)
-		len_big_endian = len_big_endian.tostring()
-		if self._transmitWithTimeout(len_big_endian) and self._transmitWithTimeout(binary):
-			return True
-		else:
-			return False
+		try:
+			return self._writeMsg(msg)
+		except socket.error as e:
+			if e.errno == errno.ECONNRESET:
+				print("CLIENT: Connection reset by peer.")
+				return False
+			else:
+				raise e
 
 	def sendOSC(self, msg):
 		"""Send an OSC message or bundle to the server. Returns True on success.
 		"""
-		self._txMutex.acquire()
-		txOk = self._transmitMsgWithTimeout(msg)
-		self._txMutex.release()
+		with self._txMutex:
+			txOk = self._transmitMsgWithTimeout(msg)
 		return txOk
 	
 	def __str__(self):
@@ -2869,4 +5840,228 @@ class OSCStreamingClient(OSCAddressSpace):
 		"""
 		return not self.__eq__(other)
 
+######
+#
+# AsyncOSCClient class
+#
+######
+
+class _AsyncOSCProtocol(asyncio.Protocol):
+	"""asyncio Protocol passing the flow-control events of an AsyncOSCClient's transport on to the Client.
+	Anything received is ignored.
+	"""
+	def __init__(self, client):
+		self.client = client
+	
+	def pause_writing(self):
+		self.client._pauseWriting()
+	
+	def resume_writing(self):
+		self.client._resumeWriting()
+	
+	def connection_lost(self, exc):
+		self.client._connectionLost(exc)
+	
+	def datagram_received(self, data, addr):
+		pass
+	
+	def error_received(self, exc):
+		self.client.errors += 1
+
+class AsyncOSCClient(object):
+	"""asyncio OSC client, sending OSCMessages & OSCBundles over UDP, or over a TCP stream with each
+	packet prefixed by its int32 length (as expected by OSCStreamingServer).
+	Packets are written straight to the transport while it accepts them. When the transport pauses
+	(its buffer is full), packets are held on an outgoing queue; once that holds 'high_water' packets,
+	send() and send_many() wait until the queue has drained down to 'low_water' packets.
+	  >>> client = AsyncOSCClient()
+	  >>> await client.connect(("localhost", 9000))
+	  >>> await client.send(OSCMessage("/hello"))
+	  >>> await client.close()
+	"""
+	# the default outgoing-queue watermarks, in packets
+	high_water = 1024
+	low_water = 256
+	
+	# a struct for packing the length-prefix of TCP packets
+	_length = struct.Struct('>L')
+	
+	def __init__(self, tcp=False, high_water=None, low_water=None):
+		"""Instantiate an AsyncOSCClient.
+		  - tcp (bool): send over a length-prefixed TCP stream instead of UDP.
+		  - high_water, low_water (int): outgoing-queue watermarks, overriding the class defaults.
+		"""
+		self.tcp = tcp
+		if high_water != None:
+			self.high_water = high_water
+		if low_water != None:
+			self.low_water = low_water
+		if self.low_water > self.high_water:
+			raise ValueError("'low_water' (%d) must not exceed 'high_water' (%d)" % (self.low_water, self.high_water))
+		
+		self.transport = None
+		self.client_address = None
+		self._queue = collections.deque()
+		self._paused = False
+		self._lost = None
+		self._writable = None
+		self._drained = None
+		
+		self.packets_sent = 0
+		self.pauses = 0
+		self.stalls = 0
+		self.errors = 0
+	
+	async def connect(self, address):
+		"""Open the transport to the given (host, port) address
+		"""
+		if self.transport != None:
+			raise OSCClientError("AsyncOSCClient is already connected to %s" % getUrlStr(self.client_address))
+		
+		loop = asyncio.get_running_loop()
+		self._writable = asyncio.Event()
+		self._writable.set()
+		self._drained = asyncio.Event()
+		self._drained.set()
+		self._lost = None
+		
+		try:
+			if self.tcp:
+				(self.transport, _) = await loop.create_connection(lambda: _AsyncOSCProtocol(self), address[0], address[1])
+			else:
+				(self.transport, _) = await loop.create_datagram_endpoint(lambda: _AsyncOSCProtocol(self), remote_addr=address)
+		except socket.error as e:
+			raise OSCClientError("Connecting to %s failed: %s" % (getUrlStr(address), str(e)))
+		
+		self.client_address = address
+	
+	def _encode(self, msg):
+		"""Returns the packet to write for the given OSCMessage or OSCBundle"""
+		if not isinstance(msg, OSCMessage):
+			raise TypeError("'msg' argument is not an OSCMessage or OSCBundle object")
+		
+		binary = msg.getBinary()
+		if self.tcp:
+			return self._length.pack(len(binary)) + binary
+		
+		return binary
+	
+	def _checkConnected(self):
+		if self.transport == None:
+			raise OSCClientError("Called send() on non-connected client")
+		if self._lost != None:
+			raise OSCClientError("Connection to %s lost: %s" % (getUrlStr(self.client_address), str(self._lost)))
+	
+	async def _reserve(self):
+		"""Wait while the outgoing queue is at its high-water mark"""
+		while len(self._queue) >= self.high_water:
+			self.stalls += 1
+			self._writable.clear()
+			await self._writable.wait()
+			self._checkConnected()
+	
+	async def send(self, msg):
+		"""Send the given OSCMessage (or OSCBundle). Only waits if the outgoing queue is full.
+		"""
+		self._checkConnected()
+		binary = self._encode(msg)
+		if len(self._queue) >= self.high_water:
+			await self._reserve()
+		
+		self._queue.append(binary)
+		self._flush()
+	
+	async def send_many(self, msgs):
+		"""Send all OSCMessages (or OSCBundles) from the given iterable. Over TCP, the packets are written
+		to the stream together. Waits whenever the outgoing queue is full.
+		"""
+		self._checkConnected()
+		queue = self._queue
+		for msg in msgs:
+			if len(queue) >= self.high_water:
+				self._flush()
+				await self._reserve()
+			
+			queue.append(self._encode(msg))
+		
+		self._flush()
+	
+	def _flush(self):
+		"""Write queued packets to the transport, until it pauses"""
+		queue = self._queue
+		if (not self._paused) and len(queue):
+			if self.tcp:
+				self.packets_sent += len(queue)
+				self.transport.write(b"".join(queue))
+				queue.clear()
+			else:
+				sendto = self.transport.sendto
+				while len(queue) and not self._paused:
+					sendto(queue.popleft())
+					self.packets_sent += 1
+		
+		if len(queue) <= self.low_water:
+			self._writable.set()
+		if len(queue):
+			self._drained.clear()
+		else:
+			self._drained.set()
+	
+	def _pauseWriting(self):
+		self._paused = True
+		self.pauses += 1
+	
+	def _resumeWriting(self):
+		self._paused = False
+		self._flush()
+	
+	def _connectionLost(self, exc):
+		if exc == None:
+			exc = "connection closed"
+		self._lost = exc
+		self._queue.clear()
+		if self._writable != None:
+			self._writable.set()
+			self._drained.set()
+	
+	async def drain(self):
+		"""Wait until the outgoing queue is empty
+		"""
+		if self._drained != None:
+			await self._drained.wait()
+	
+	def getStats(self):
+		"""Returns a dict with the number of 'packets' written to the transport, the number of packets 'queued',
+		how often the transport 'paused', how often sending 'stalled' on a full queue,
+		and the number of 'errors' reported by the transport
+		"""
+		return {'packets':self.packets_sent, 'queued':len(self._queue), 'pauses':self.pauses,
+				'stalls':self.stalls, 'errors':self.errors}
+	
+	async def close(self):
+		"""Send any queued packets, and close the transport
+		"""
+		if self.transport == None:
+			return
+		
+		if self._lost == None:
+			await self.drain()
+		self.transport.close()
+		self.transport = None
+	
+	def __str__(self):
+		"""Returns a string containing this Client's Class-name, software-version
+		and the remote-address it is connected to (if any)
+		"""
+		out = self.__class__.__name__
+		out += " v%s.%s-%s" % version
+		if self.client_address:
+			out += " connected to osc://%s" % getUrlStr(self.client_address)
+			if self.tcp:
+				out += " over TCP"
+		else:
+			out += " (unconnected)"
+		
+		return out
+
 # vim:noexpandtab
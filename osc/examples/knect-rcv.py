@@ -4,19 +4,8 @@ import sys
 from time import sleep
 
 server = OSCServer( ("localhost", 7110) )
-server.timeout = 0
 run = True
 
-# this method of reporting timeouts only works by convention
-# that before calling handle_request() field .timed_out is 
-# set to False
-def handle_timeout(self):
-    self.timed_out = True
-
-# funny python's way to add a method to an instance of a class
-import types
-server.handle_timeout = types.MethodType(handle_timeout, server)
-
 def user_callback(path, tags, args, source):
     # which user will be determined by path:
     # we just throw away all slashes and join together what's left
@@ -36,14 +25,15 @@ server.addMsgHandler( "/user/2", user_callback )
 server.addMsgHandler( "/user/3", user_callback )
 server.addMsgHandler( "/user/4", user_callback )
 server.addMsgHandler( "/quit", quit_callback )
+# report (rather than raise NoCallbackError on) messages no handler matches
+server.addMsgHandler( "default", server.noCallback_handler )
 
 # user script that's called by the game engine every frame
 def each_frame():
-    # clear timed_out flag
-    server.timed_out = False
-    # handle all pending requests then return
-    while not server.timed_out:
-        server.handle_request()
+    # handle all pending messages then return
+    # (timeout=0 means: don't wait for new messages)
+    for msg in server.iter_messages(timeout=0):
+        server.dispatchMessage(msg.address, msg.tags, msg.data, msg.source)
 
 # simulate a "game engine"
 while run:
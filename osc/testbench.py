@@ -182,6 +182,276 @@ def testStreamingServerAndClient(listen_address):
 	sys.exit()
 			
 
+def testDecoding(rounds=200, repeats=5, tolerance=1.2):
+	""" Fuzz- and throughput-test for the OSC decoder.
+	A corpus of valid packets is mangled (truncated, bit-flipped, given bogus
+	sizes and typetags, or stray trailing bytes). In strict mode, each mangled
+	packet must either decode, or raise OSCDecodeError, without printing anything.
+	Decoding the mangled packets may not cost more (per packet) than decoding
+	the valid ones, comparing the medians of 'repeats' timed runs, give or take
+	a factor 'tolerance' for timing noise. In non-strict mode (as used by OSCServer), decoding each
+	mangled packet must finish (with or without an exception) without printing.
+	"""
+	import threading
+	import random, io, contextlib
+	random.seed(2222)
+
+	message = OSCMessage("/print")
+	message += [44, 11, 4.5, "the white cliffs of dover"]
+	blob = OSCMessage("/pri*")
+	blob.append("blobs", "b")
+	blob.append(3.1415926, "d")
+	bundle = OSCBundle("/*print")
+	bundle.append(message)
+	bundle.append(("no,", 3, "actually."))
+	nested = OSCBundle()
+	nested.setTimeTag(time.time())
+	nested.append(bundle)
+	nested.append(blob)
+
+	valid = [m.getBinary() for m in (message, blob, bundle, nested)]
+	malformed = []
+	for packet in valid:
+		for n in range(len(packet)):
+			malformed.append(packet[:n])
+		for i in range(len(packet)):
+			flipped = bytearray(packet)
+			flipped[random.randrange(len(packet))] ^= (1 << random.randrange(8))
+			malformed.append(bytes(flipped))
+		malformed.append(packet[:-4] + b'\x7f\xff\xff\xff')
+		malformed.append(packet.replace(b',', b',x', 1))
+		for n in range(1, 4):
+			malformed.append(packet + b'\x00' * n)
+
+	def decodeAll(packets):
+		failures = 0
+		start = time.perf_counter()
+		for i in range(rounds):
+			for packet in packets:
+				try:
+					decodeOSC(packet, True)
+				except OSCDecodeError:
+					pass
+				except Exception as e:
+					failures += 1
+		return ((time.perf_counter() - start) / (rounds * len(packets)), failures)
+
+	def decodeNonStrict(packets, done):
+		for packet in packets:
+			try:
+				decodeOSC(packet, False)
+			except Exception:
+				pass
+		done.append(True)
+
+	output = io.StringIO()
+	with contextlib.redirect_stdout(output):
+		valid_times = []
+		malformed_times = []
+		valid_failures = malformed_failures = 0
+		for i in range(repeats):
+			(elapsed, failures) = decodeAll(valid)
+			valid_times.append(elapsed)
+			valid_failures += failures
+			(elapsed, failures) = decodeAll(malformed)
+			malformed_times.append(elapsed)
+			malformed_failures += failures
+		valid_time = sorted(valid_times)[repeats // 2]
+		malformed_time = sorted(malformed_times)[repeats // 2]
+		
+		# a hanging decode would never return, so decode in a thread with a deadline
+		done = []
+		t = threading.Thread(target=decodeNonStrict, args=(malformed, done))
+		t.daemon = True
+		t.start()
+		t.join(10.)
+		nonstrict_ok = bool(done)
+
+	print("valid packets:     %d, median %.2f us/packet, %d unexpected exceptions" % (len(valid), valid_time * 1e6, valid_failures))
+	print("malformed packets: %d, median %.2f us/packet, %d unexpected exceptions" % (len(malformed), malformed_time * 1e6, malformed_failures))
+	print("non-strict decoding of malformed packets: %s" % (nonstrict_ok and "finished" or "HUNG"))
+	print("characters printed while decoding: %d" % len(output.getvalue()))
+
+	ok = (valid_failures == 0) and (malformed_failures == 0) and nonstrict_ok and (not len(output.getvalue())) and (malformed_time <= valid_time * tolerance)
+	print(ok and "OK" or "FAILED")
+	sys.exit(not ok)
+
+def testJitter(seconds=1.):
+	""" Latency & jitter benchmark for the real-time tuning knobs.
+	Messages are sent over loopback once per millisecond, while all CPUs are kept
+	busy by other processes, and the receiving callback creates garbage. For each knob
+	the receive-latency percentiles and the longest garbage-collection pause are printed.
+	"""
+	import subprocess, gc
+	ballast = [[i] for i in range(500000)]	# long-lived objects, for the garbage-collector to traverse
+	cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else []
+	
+	configs = [("untuned", None, False),
+			("gc.freeze()", None, True),
+			("nice -10", {'nice':-10}, False),
+			("SCHED_FIFO 50", {'fifo_priority':50}, False)]
+	if len(cpus) > 1:
+		configs.insert(2, ("affinity cpu %d" % cpus[-1], {'affinity':[cpus[-1]]}, False))
+	configs.append(("all of the above", {'affinity':cpus[-1:] or None, 'nice':-10, 'fifo_priority':50}, True))
+	
+	load = [subprocess.Popen([sys.executable, "-c", "while True: pass"]) for i in range(max(len(cpus), 1))]
+	try:
+		print("%-18s %9s %9s %9s %9s %12s  %s" % ("knob", "received", "p50 ms", "p99 ms", "max ms", "max gc us", "result"))
+		for (name, options, freeze) in configs:
+			gc.unfreeze()
+			if freeze:
+				freezeGC()
+			
+			latencies = []
+			def callback(addr, tags, data, client_address):
+				latencies.append(time.time_ns() - data[0].ns())
+				for i in range(50):	# some garbage, that only the garbage-collector can free
+					cycle = []
+					cycle.append(cycle)
+			
+			server = OSCServer(("127.0.0.1", 0))
+			server.addMsgHandler("/jitter", callback)
+			if options != None:
+				server.setRealtime(**options)
+			monitor = OSCGCMonitor()
+			monitor.start()
+			thread = threading.Thread(target=server.serve_forever)
+			thread.start()
+			
+			client = OSCClient()
+			client.connect(server.server_address)
+			end = time.time() + seconds
+			while time.time() < end:
+				msg = OSCMessage("/jitter")
+				msg.append(NTPTime.now())
+				client.send(msg)
+				time.sleep(0.001)
+			
+			time.sleep(0.1)
+			monitor.stop()
+			server.close()
+			thread.join()
+			client.close()
+			
+			latencies.sort()
+			if not len(latencies):
+				latencies = [0]
+			result = ", ".join("%s: %s" % (knob, value) for (knob, value) in list(server.realtime_results.items()) if value != True)
+			print("%-18s %9d %9.3f %9.3f %9.3f %12.3f  %s" % (name, len(latencies), latencies[len(latencies) // 2] / 1e6,
+				latencies[int(len(latencies) * 0.99)] / 1e6, latencies[-1] / 1e6, monitor.getStats()["max"] * 1e6, result or "ok"))
+	finally:
+		for process in load:
+			process.kill()
+		gc.unfreeze()
+	
+	sys.exit(0)
+
+def testTimetags(delay=0.3, jitter_delay=0.02):
+	""" Test that a bundle with a timetag in the future doesn't block the server.
+	A bundle due in 'delay' seconds is sent, followed by a plain message: the message
+	must be handled right away, and the bundle's contents when due. After the server
+	is closed, its scheduler must ignore newly scheduled items, and not restart its thread.
+	The same is then sent, sequence-numbered, to a server with a jitter-buffer: the bundle must
+	be handled when due (plus the buffer's delay), and the plain message only after it.
+	"""
+	def send(sequenced):
+		handled = {}
+		def callback(addr, tags, data, client_address):
+			handled[addr] = time.time()
+		
+		server = OSCServer(("127.0.0.1", 0))
+		server.addMsgHandler("/now", callback)
+		server.addMsgHandler("/later", callback)
+		if sequenced:
+			server.setJitterBuffer(jitter_delay)
+			server.setSequenceTracking()
+		thread = threading.Thread(target=server.serve_forever)
+		thread.start()
+		
+		client = OSCClient()
+		client.connect(server.server_address)
+		if sequenced:
+			client.setSequencing()
+		start = time.time()
+		bundle = OSCBundle("/later")
+		bundle.setTimeTag(start + delay)
+		bundle.append(1)
+		client.send(bundle)
+		client.send(OSCMessage("/now"))
+		
+		time.sleep(delay + 0.2)
+		server.close()
+		thread.join()
+		client.close()
+		
+		now_latency = handled.get("/now", float('inf')) - start
+		later_error = handled.get("/later", float('inf')) - (start + delay)
+		return (server, now_latency, later_error)
+	
+	(server, now_latency, later_error) = send(False)
+	rescheduled = server.scheduler.schedule(time.time(), lambda: None)
+	restarted = server.scheduler.running or (server.scheduler._thread != None)
+	
+	print("plain message handled after:   %.3f ms" % (now_latency * 1e3))
+	print("future bundle handled late by: %.3f ms" % (later_error * 1e3))
+	print("scheduling after close():      %s" % ((rescheduled or restarted) and "restarted the scheduler" or "ignored"))
+	ok = (now_latency < delay / 2) and (0 <= later_error < 0.05) and not (rescheduled or restarted)
+	
+	(server, seq_now_latency, seq_later_error) = send(True)
+	print("sequenced, with a %.0f ms jitter-buffer:" % (jitter_delay * 1e3))
+	print("  future bundle handled late by: %.3f ms" % (seq_later_error * 1e3))
+	print("  plain message handled after:   %.3f ms" % (seq_now_latency * 1e3))
+	ok = ok and (jitter_delay <= seq_later_error < jitter_delay + 0.05) and (seq_now_latency >= delay + seq_later_error)
+	
+	print(ok and "OK" or "FAILED")
+	sys.exit(not ok)
+
+def testSendRate(seconds=1.):
+	""" Loopback send-throughput benchmark.
+	Measures how many messages per second OSCClient.send() and OSCClient.sendto()
+	(by a plain client, and by a client sharing an OSCServer's socket) can send.
+	The receiving socket is never read; it simply drops what doesn't fit its buffer.
+	"""
+	sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+	sink.bind(("127.0.0.1", 0))
+	target = sink.getsockname()
+	msg = OSCMessage("/bench")
+	msg += [1, 2.5, "three"]
+	
+	def rate(send):
+		count = 0
+		start = time.perf_counter()
+		end = start + seconds
+		while True:
+			for i in range(100):
+				send()
+			count += 100
+			now = time.perf_counter()
+			if now >= end:
+				return count / (now - start)
+	
+	client = OSCClient()
+	client.connect(target)
+	print("send()              %9.0f msgs/s" % rate(lambda: client.send(msg)))
+	print("sendto()            %9.0f msgs/s" % rate(lambda: client.sendto(msg, target)))
+	print("sendto(), timeout   %9.0f msgs/s" % rate(lambda: client.sendto(msg, target, 1.)))
+	client.close()
+	
+	bundling = OSCBundlingClient()
+	bundling.connect(target)
+	print("bundling send()     %9.0f msgs/s" % rate(lambda: bundling.send(msg)), end='')
+	bundling.flush()
+	stats = bundling.getStats()
+	print(", %.1f msgs/packet" % (stats['messages'] / float(stats['packets'])))
+	bundling.close()
+	
+	server = OSCServer(("127.0.0.1", 0))
+	print("server-client sendto() %6.0f msgs/s" % rate(lambda: server.client.sendto(msg, target)))
+	server.close()
+	sink.close()
+	
+	sys.exit(0)
+
 ###############################################################################
 ## MAIN TESTBENCH
 ###############################################################################
@@ -204,12 +474,27 @@ if __name__ == "__main__":
 	
 	op.add_option("-c", "--streaming", action="store_true", dest="streaming",
 			help="Test streaming OSC (OSC over TCP)")
+	op.add_option("-z", "--fuzz", action="store_true", dest="fuzz",
+			help="Fuzz- and throughput-test the OSC decoder")
+	op.add_option("-b", "--benchmark", action="store_true", dest="benchmark",
+			help="Benchmark the loopback send-rate of OSCClient")
+	op.add_option("-j", "--jitter", action="store_true", dest="jitter",
+			help="Benchmark receive-latency & jitter with each of the real-time tuning knobs")
+	op.add_option("-T", "--timetags", action="store_true", dest="timetags",
+			help="Test that bundles with a future timetag don't block the server")
+	op.add_option("-m", "--multicast", dest="multicast",
+			help="send to & receive from the given multicast group[@interface], e.g. '239.255.0.1@127.0.0.1'")
 	
 	op.set_defaults(listen=":%d" % default_port)
 	op.set_defaults(sendto="")
 	op.set_defaults(threading=False)
 	op.set_defaults(forking=False)
 	op.set_defaults(streaming=False)
+	op.set_defaults(multicast=None)
+	op.set_defaults(fuzz=False)
+	op.set_defaults(jitter=False)
+	op.set_defaults(benchmark=False)
+	op.set_defaults(timetags=False)
 
 	# Parse args
 	(opts, args) = op.parse_args()
@@ -244,6 +529,18 @@ if __name__ == "__main__":
 		testStreamingServerAndClient(listen_address)
 		sys.exit(0)
 	
+	if opts.fuzz:
+		testDecoding()
+	
+	if opts.jitter:
+		testJitter()
+	
+	if opts.benchmark:
+		testSendRate()
+	
+	if opts.timetags:
+		testTimetags()
+	
 	welcome = "Welcome to the OSC testing program."
 	print(welcome)
 	hexDump(welcome)
@@ -327,6 +624,11 @@ if __name__ == "__main__":
 	if len(targets):
 		c = OSCMultiClient()
 		c.updateOSCTargets(targets)
+	elif opts.multicast:
+		(group, _, interface) = opts.multicast.partition('@')
+		c = OSCClient()
+		c.setMulticastOptions(interface=(interface or None))
+		c.connect((group, listen_address[1]))	# our OSCServer joins this group
 	else:
 		c = OSCClient()
 		c.connect(listen_address)	# connect back to our OSCServer
@@ -354,12 +656,24 @@ if __name__ == "__main__":
 		msg.append(msg_string)
 		return msg
 
+	# a Client sending to a multicast group can't share the server's socket;
+	# connecting that socket to the group would stop the server from receiving
+	if opts.multicast:
+		srv_client = None
+	else:
+		srv_client = c
+	
 	if opts.threading:
-		s = ThreadingOSCServer(listen_address, c, return_port=listen_address[1])
+		s = ThreadingOSCServer(listen_address, srv_client, return_port=listen_address[1])
 	elif opts.forking:
-		s = ForkingOSCServer(listen_address, c, return_port=listen_address[1])
+		s = ForkingOSCServer(listen_address, srv_client, return_port=listen_address[1])
 	else:
-		s = OSCServer(listen_address, c, return_port=listen_address[1])
+		s = OSCServer(listen_address, srv_client, return_port=listen_address[1])
+	
+	if opts.multicast:
+		(group, _, interface) = opts.multicast.partition('@')
+		s.joinMulticastGroup(group, interface or '0.0.0.0')
+		print("Joined multicast group %s" % group)
 	
 	print(s)
 	
@@ -432,10 +746,7 @@ if __name__ == "__main__":
 	
 	waitbundle = OSCBundle("/print")
 	waitbundle.setTimeTag(time.time() + 5)
-	if s.__class__ == OSCServer:
-		waitbundle.append("Note how the (single-thread) OSCServer blocks while holding this bundle")
-	else:
-		waitbundle.append("Note how the %s does not block while holding this bundle" % s.__class__.__name__)
+	waitbundle.append("Note how the %s does not block while holding this bundle" % s.__class__.__name__)
 	
 	print("Set timetag 5 s into the future")
 	print("sending: ", waitbundle)
@@ -462,10 +773,8 @@ if __name__ == "__main__":
 	b.append("held for 15 sec")
 	bb.append(b)
 	
-	if s.__class__ == OSCServer:
-		bb.append("Note how the (single-thread) OSCServer handles the bundle's contents in order of appearance")
-	else:
-		bb.append("Note how the %s handles the sub-bundles in the order dictated by their timestamps" % s.__class__.__name__)
+	bb.append("Note how the %s handles the sub-bundles in the order dictated by their timestamps" % s.__class__.__name__)
+	if s.__class__ != OSCServer:
 		bb.append("Each bundle's contents, however, are processed in random order (dictated by the kernel's threading)")
 	
 	print("sending: ", bb)